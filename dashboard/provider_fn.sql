@@ -0,0 +1,9 @@
+CREATE OR REPLACE FUNCTION main.fmapi_demo.provider_of(lowered_name STRING)
+RETURNS STRING
+RETURN CASE
+    WHEN contains(lowered_name, 'claude') OR contains(lowered_name, 'anthropic') THEN 'Anthropic'
+    WHEN contains(lowered_name, 'gpt') OR contains(lowered_name, 'openai') THEN 'OpenAI'
+    WHEN contains(lowered_name, 'gemini') OR contains(lowered_name, 'google') THEN 'Google'
+    WHEN contains(lowered_name, 'llama') OR contains(lowered_name, 'meta') THEN 'Meta'
+    ELSE 'Other'
+END;
@@ -0,0 +1,22 @@
+CREATE OR REPLACE MATERIALIZED VIEW main.fmapi_demo.mv_all_model_usage_daily
+SCHEDULE EVERY 1 HOUR
+AS SELECT
+    DATE(u.request_time) as request_date,
+    main.fmapi_demo.provider_of(LOWER(CONCAT_WS('|', e.entity_name, e.endpoint_name))) as provider,
+    e.endpoint_name,
+    COALESCE(e.served_entity_name, e.entity_name) as model_name,
+    u.requester,
+    COUNT(*) as requests,
+    SUM(u.input_token_count) as input_token_count,
+    SUM(u.output_token_count) as output_token_count,
+    SUM(u.input_token_count + u.output_token_count) as total_tokens
+FROM system.serving.endpoint_usage u
+JOIN system.serving.served_entities e
+    ON u.served_entity_id = e.served_entity_id
+WHERE e.entity_type = 'FOUNDATION_MODEL'
+   OR e.external_model_config IS NOT NULL
+GROUP BY 1, 2, 3, 4, 5;
+CREATE OR REPLACE MATERIALIZED VIEW main.fmapi_demo.mv_usage_dims
+SCHEDULE EVERY 6 HOURS
+AS SELECT DISTINCT provider, endpoint_name, model_name
+FROM main.fmapi_demo.mv_all_model_usage_daily;
@@ -14,18 +14,95 @@ Usage:
 """
 
 import json
-import uuid
-from typing import Optional, List, Dict, Any
+import secrets
+import sys
+from functools import lru_cache
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+# Invariant spec fragments, shared by reference across widgets. The builder
+# and serializer only ever read these, so one instance can back every widget.
+_QUANT_SCALE = {"type": "quantitative"}
+_CAT_SCALE = {"type": "categorical"}
+_TEMPORAL_SCALE = {"type": "temporal"}
+_LABEL_SHOWN = {"show": True}
+_LABEL_HIDDEN = {"show": False}
+_UI_SETTINGS = {
+    "theme": {
+        "widgetHeaderAlignment": "ALIGNMENT_UNSPECIFIED"
+    },
+    "applyModeEnabled": False
+}
+
+
+@lru_cache(maxsize=64)
+def _frame(title: Optional[str]) -> dict:
+    """Build (and memoize) a frame dict for the given title."""
+    return {"showTitle": title is not None, "title": title or ""}
+
+
+@lru_cache(maxsize=512)
+def _qident(name: str) -> str:
+    """Backtick-quote a field identifier (memoized for hot field names)."""
+    return f"`{name}`"
+
+
+# Default widget positions as (x, y, width, height), shared across calls
+_DEFAULT_POS_CHART = (0, 0, 3, 4)    # bar, line, scatter
+_DEFAULT_POS_PIE = (0, 0, 2, 4)
+_DEFAULT_POS_COUNTER = (0, 0, 1, 2)
+_DEFAULT_POS_TABLE = (0, 0, 6, 5)
+_DEFAULT_POS_FILTER = (0, 0, 1, 2)
+
+
+# Column type -> (displayAs, alignContent) for table widgets
+_COLTYPE_META = {
+    "integer": ("number", "right"),
+    "float": ("number", "right"),
+    "datetime": ("datetime", "right"),
+    "string": ("string", "left"),
+}
+
+
+def _column_encoding(i: int, col: dict[str, Any]) -> dict:
+    """Build one table column encoding from its definition."""
+    field_name = col["field"]
+    col_type = col.get("type", "string")
+    display_as, align = _COLTYPE_META.get(col_type, ("string", "left"))
+    title = col.get("title", field_name)
+
+    encoding = {
+        "fieldName": field_name,
+        "type": col_type,
+        "displayAs": display_as,
+        "title": title,
+        "displayName": title,
+        "order": 100000 + i,
+        "alignContent": align
+    }
+
+    if "format" in col and col_type in ("integer", "float"):
+        encoding["numberFormat"] = col["format"]
+
+    return encoding
 
 
 class LakeviewDashboard:
     """Builder class for creating Lakeview dashboard JSON payloads."""
 
-    # Default color palette
-    DEFAULT_COLORS = [
+    __slots__ = ("name", "datasets", "pages", "_current_page", "_cached_json")
+
+    # Default color palette (tuple: immutable, so one instance is safely
+    # shared by reference across every widget that uses the defaults)
+    DEFAULT_COLORS = (
         "#FFAB00", "#00A972", "#FF3621", "#8BCAE7",
         "#AB4057", "#99DDB4", "#FCA4A1", "#919191", "#BF7080"
-    ]
+    )
 
     def __init__(self, name: str = "New Dashboard"):
         """Initialize a new dashboard.
@@ -34,9 +111,11 @@ class LakeviewDashboard:
             name: Display name for the dashboard
         """
         self.name = name
-        self.datasets: List[Dict] = []
-        self.pages: List[Dict] = []
-        self._current_page: Optional[Dict] = None
+        self.datasets: list[dict] = []
+        self.pages: list[dict] = []
+        self._current_page: Optional[dict] = None
+        # Memoized to_json output, keyed by indent; cleared on any mutation
+        self._cached_json: Optional[tuple] = None
 
         # Create default page
         self.add_page("Overview")
@@ -44,7 +123,7 @@ class LakeviewDashboard:
     @staticmethod
     def _generate_id() -> str:
         """Generate a unique 8-character hex ID."""
-        return uuid.uuid4().hex[:8]
+        return secrets.token_hex(4)
 
     def add_dataset(self, name: str, display_name: str, query: str) -> str:
         """Add a dataset (SQL query) to the dashboard.
@@ -63,6 +142,7 @@ class LakeviewDashboard:
             "queryLines": [query]
         }
         self.datasets.append(dataset)
+        self._cached_json = None
         return name
 
     def add_page(self, display_name: str) -> str:
@@ -83,32 +163,106 @@ class LakeviewDashboard:
         }
         self.pages.append(page)
         self._current_page = page
+        self._cached_json = None
         return page_id
 
-    def _add_widget(self, widget: Dict, position: Dict[str, int]) -> None:
+    def _add_widget(
+        self,
+        widget: dict,
+        position: Optional[dict[str, int]],
+        default: tuple = (0, 0, 2, 3)
+    ) -> None:
         """Add a widget to the current page.
 
+        Internally the layout is kept as compact (widget, x, y, width, height)
+        tuples; the nested {"widget": ..., "position": {...}} form is only
+        materialized in to_dict(). This avoids one position dict and one
+        layout-item dict per widget during construction.
+
         Args:
             widget: Widget configuration
-            position: Position dict with x, y, width, height
+            position: Position dict with x, y, width, height, or None
+            default: (x, y, width, height) used when position is None
         """
         if self._current_page is None:
             raise ValueError("No page exists. Call add_page() first.")
 
-        layout_item = {
-            "widget": widget,
-            "position": {
-                "x": position.get("x", 0),
-                "y": position.get("y", 0),
-                "width": position.get("width", 2),
-                "height": position.get("height", 3)
+        if position is None:
+            x, y, width, height = default
+        else:
+            x = position.get("x", 0)
+            y = position.get("y", 0)
+            width = position.get("width", 2)
+            height = position.get("height", 3)
+        self._current_page["layout"].append((widget, x, y, width, height))
+        self._cached_json = None
+
+    def _create_field(self, name: str, expression: str) -> dict:
+        """Create a field definition."""
+        return {"name": name, "expression": expression}
+
+    @staticmethod
+    def _main_query_widget(
+        widget_id: str,
+        dataset_name: str,
+        fields: list[dict],
+        spec: dict,
+        disaggregated: bool = False
+    ) -> dict:
+        """Assemble the widget shell shared by every chart/counter/table builder.
+
+        Building this nested structure in one place keeps the per-widget
+        bytecode small instead of repeating the literal in each add_* method.
+        """
+        return {
+            "name": widget_id,
+            "queries": [{
+                "name": "main_query",
+                "query": {
+                    "datasetName": dataset_name,
+                    "fields": fields,
+                    "disaggregated": disaggregated
+                }
+            }],
+            "spec": spec
+        }
+
+    @staticmethod
+    def _build_encodings(
+        x_name: str,
+        x_display: str,
+        x_scale: dict,
+        y_name: str,
+        y_display: str,
+        y_scale: dict = _QUANT_SCALE,
+        color_field: Optional[str] = None,
+        show_labels: Optional[bool] = None
+    ) -> dict:
+        """Build the x/y(/label/color) encodings shared by bar, line and scatter."""
+        encodings = {
+            "x": {
+                "fieldName": x_name,
+                "scale": x_scale,
+                "displayName": x_display
+            },
+            "y": {
+                "fieldName": y_name,
+                "scale": y_scale,
+                "displayName": y_display
             }
         }
-        self._current_page["layout"].append(layout_item)
 
-    def _create_field(self, name: str, expression: str) -> Dict:
-        """Create a field definition."""
-        return {"name": name, "expression": expression}
+        if show_labels is not None:
+            encodings["label"] = _LABEL_SHOWN if show_labels else _LABEL_HIDDEN
+
+        if color_field:
+            encodings["color"] = {
+                "fieldName": color_field,
+                "scale": _CAT_SCALE,
+                "displayName": color_field
+            }
+
+        return encodings
 
     def add_bar_chart(
         self,
@@ -117,8 +271,8 @@ class LakeviewDashboard:
         y_field: str,
         y_agg: str = "SUM",
         title: Optional[str] = None,
-        position: Optional[Dict[str, int]] = None,
-        colors: Optional[List[str]] = None,
+        position: Optional[dict[str, int]] = None,
+        colors: Optional[list[str]] = None,
         show_labels: bool = True,
         color_field: Optional[str] = None,
         sort_descending: bool = False
@@ -144,68 +298,42 @@ class LakeviewDashboard:
         widget_id = self._generate_id()
 
         # Build fields
-        y_name = f"{y_agg.lower()}({y_field})"
+        # Derived names recur across widgets on the same dataset; intern them
+        # so duplicates share one string object in large dashboards.
+        y_name = sys.intern(f"{y_agg.lower()}({y_field})")
         fields = [
-            self._create_field(x_field, f"`{x_field}`"),
-            self._create_field(y_name, f"{y_agg}(`{y_field}`)")
+            self._create_field(x_field, _qident(x_field)),
+            self._create_field(y_name, f"{y_agg}({_qident(y_field)})")
         ]
 
         if color_field:
-            fields.append(self._create_field(color_field, f"`{color_field}`"))
+            fields.append(self._create_field(color_field, _qident(color_field)))
 
         # Build x-axis scale with optional sorting
         # Note: Lakeview uses "y-reversed" to show largest values first (left-to-right)
-        x_scale = {"type": "categorical"}
         if sort_descending:
-            x_scale["sort"] = {"by": "y-reversed"}
-
-        # Build encodings
-        encodings = {
-            "x": {
-                "fieldName": x_field,
-                "scale": x_scale,
-                "displayName": x_field
-            },
-            "y": {
-                "fieldName": y_name,
-                "scale": {"type": "quantitative"},
-                "displayName": f"{y_agg} of {y_field}"
-            },
-            "label": {"show": show_labels}
-        }
+            x_scale = {"type": "categorical", "sort": {"by": "y-reversed"}}
+        else:
+            x_scale = _CAT_SCALE
 
-        if color_field:
-            encodings["color"] = {
-                "fieldName": color_field,
-                "scale": {"type": "categorical"},
-                "displayName": color_field
-            }
+        encodings = self._build_encodings(
+            x_field, x_field, x_scale,
+            y_name, sys.intern(f"{y_agg} of {y_field}"),
+            color_field=color_field,
+            show_labels=show_labels,
+        )
 
-        widget = {
-            "name": widget_id,
-            "queries": [{
-                "name": "main_query",
-                "query": {
-                    "datasetName": dataset_name,
-                    "fields": fields,
-                    "disaggregated": False
-                }
-            }],
-            "spec": {
-                "version": 3,
-                "widgetType": "bar",
-                "encodings": encodings,
-                "frame": {
-                    "showTitle": title is not None,
-                    "title": title or ""
-                },
-                "mark": {
-                    "colors": colors or self.DEFAULT_COLORS
-                }
+        widget = self._main_query_widget(widget_id, dataset_name, fields, {
+            "version": 3,
+            "widgetType": "bar",
+            "encodings": encodings,
+            "frame": _frame(title),
+            "mark": {
+                "colors": colors or self.DEFAULT_COLORS
             }
-        }
+        })
 
-        self._add_widget(widget, position or {"x": 0, "y": 0, "width": 3, "height": 4})
+        self._add_widget(widget, position, _DEFAULT_POS_CHART)
         return widget_id
 
     def add_line_chart(
@@ -216,7 +344,7 @@ class LakeviewDashboard:
         y_agg: str = "SUM",
         time_grain: Optional[str] = None,
         title: Optional[str] = None,
-        position: Optional[Dict[str, int]] = None,
+        position: Optional[dict[str, int]] = None,
         color_field: Optional[str] = None
     ) -> str:
         """Add a line chart widget.
@@ -238,66 +366,38 @@ class LakeviewDashboard:
 
         # Build X field expression
         if time_grain:
-            x_name = f"{time_grain.lower()}({x_field})"
-            x_expr = f'DATE_TRUNC("{time_grain}", `{x_field}`)'
-            x_scale_type = "temporal"
+            x_name = sys.intern(f"{time_grain.lower()}({x_field})")
+            x_expr = f'DATE_TRUNC("{time_grain}", {_qident(x_field)})'
+            x_scale = _TEMPORAL_SCALE
         else:
             x_name = x_field
-            x_expr = f"`{x_field}`"
-            x_scale_type = "categorical"
+            x_expr = _qident(x_field)
+            x_scale = _CAT_SCALE
 
-        y_name = f"{y_agg.lower()}({y_field})"
+        y_name = sys.intern(f"{y_agg.lower()}({y_field})")
 
         fields = [
             self._create_field(x_name, x_expr),
-            self._create_field(y_name, f"{y_agg}(`{y_field}`)")
+            self._create_field(y_name, f"{y_agg}({_qident(y_field)})")
         ]
 
         if color_field:
-            fields.append(self._create_field(color_field, f"`{color_field}`"))
+            fields.append(self._create_field(color_field, _qident(color_field)))
 
-        encodings = {
-            "x": {
-                "fieldName": x_name,
-                "scale": {"type": x_scale_type},
-                "displayName": x_field
-            },
-            "y": {
-                "fieldName": y_name,
-                "scale": {"type": "quantitative"},
-                "displayName": f"{y_agg} of {y_field}"
-            }
-        }
-
-        if color_field:
-            encodings["color"] = {
-                "fieldName": color_field,
-                "scale": {"type": "categorical"},
-                "displayName": color_field
-            }
+        encodings = self._build_encodings(
+            x_name, x_field, x_scale,
+            y_name, sys.intern(f"{y_agg} of {y_field}"),
+            color_field=color_field,
+        )
 
-        widget = {
-            "name": widget_id,
-            "queries": [{
-                "name": "main_query",
-                "query": {
-                    "datasetName": dataset_name,
-                    "fields": fields,
-                    "disaggregated": False
-                }
-            }],
-            "spec": {
-                "version": 3,
-                "widgetType": "line",
-                "encodings": encodings,
-                "frame": {
-                    "showTitle": title is not None,
-                    "title": title or ""
-                }
-            }
-        }
+        widget = self._main_query_widget(widget_id, dataset_name, fields, {
+            "version": 3,
+            "widgetType": "line",
+            "encodings": encodings,
+            "frame": _frame(title)
+        })
 
-        self._add_widget(widget, position or {"x": 0, "y": 0, "width": 3, "height": 4})
+        self._add_widget(widget, position, _DEFAULT_POS_CHART)
         return widget_id
 
     def add_pie_chart(
@@ -307,7 +407,7 @@ class LakeviewDashboard:
         color_field: str,
         angle_agg: str = "COUNT",
         title: Optional[str] = None,
-        position: Optional[Dict[str, int]] = None
+        position: Optional[dict[str, int]] = None
     ) -> str:
         """Add a pie chart widget.
 
@@ -328,45 +428,33 @@ class LakeviewDashboard:
             angle_name = "count(*)"
             angle_expr = "COUNT(`*`)"
         else:
-            angle_name = f"{angle_agg.lower()}({angle_field})"
-            angle_expr = f"{angle_agg}(`{angle_field}`)"
+            angle_name = sys.intern(f"{angle_agg.lower()}({angle_field})")
+            angle_expr = f"{angle_agg}({_qident(angle_field)})"
 
-        widget = {
-            "name": widget_id,
-            "queries": [{
-                "name": "main_query",
-                "query": {
-                    "datasetName": dataset_name,
-                    "fields": [
-                        self._create_field(angle_name, angle_expr),
-                        self._create_field(color_field, f"`{color_field}`")
-                    ],
-                    "disaggregated": False
-                }
-            }],
-            "spec": {
-                "version": 3,
-                "widgetType": "pie",
-                "encodings": {
-                    "angle": {
-                        "fieldName": angle_name,
-                        "scale": {"type": "quantitative"},
-                        "displayName": f"{angle_agg} of Records" if angle_agg == "COUNT" else f"{angle_agg} of {angle_field}"
-                    },
-                    "color": {
-                        "fieldName": color_field,
-                        "scale": {"type": "categorical"},
-                        "displayName": color_field
-                    }
+        fields = [
+            self._create_field(angle_name, angle_expr),
+            self._create_field(color_field, _qident(color_field))
+        ]
+
+        widget = self._main_query_widget(widget_id, dataset_name, fields, {
+            "version": 3,
+            "widgetType": "pie",
+            "encodings": {
+                "angle": {
+                    "fieldName": angle_name,
+                    "scale": _QUANT_SCALE,
+                    "displayName": f"{angle_agg} of Records" if angle_agg == "COUNT" else f"{angle_agg} of {angle_field}"
                 },
-                "frame": {
-                    "showTitle": title is not None,
-                    "title": title or ""
+                "color": {
+                    "fieldName": color_field,
+                    "scale": _CAT_SCALE,
+                    "displayName": color_field
                 }
-            }
-        }
+            },
+            "frame": _frame(title)
+        })
 
-        self._add_widget(widget, position or {"x": 0, "y": 0, "width": 2, "height": 4})
+        self._add_widget(widget, position, _DEFAULT_POS_PIE)
         return widget_id
 
     def add_counter(
@@ -375,7 +463,7 @@ class LakeviewDashboard:
         value_field: str,
         value_agg: str = "SUM",
         title: Optional[str] = None,
-        position: Optional[Dict[str, int]] = None
+        position: Optional[dict[str, int]] = None
     ) -> str:
         """Add a counter/KPI widget.
 
@@ -395,41 +483,27 @@ class LakeviewDashboard:
             value_name = "count(*)"
             value_expr = "COUNT(`*`)"
         elif value_agg == "COUNT_DISTINCT":
-            value_name = f"count_distinct({value_field})"
-            value_expr = f"COUNT(DISTINCT `{value_field}`)"
+            value_name = sys.intern(f"count_distinct({value_field})")
+            value_expr = f"COUNT(DISTINCT {_qident(value_field)})"
         else:
-            value_name = f"{value_agg.lower()}({value_field})"
-            value_expr = f"{value_agg}(`{value_field}`)"
-
-        widget = {
-            "name": widget_id,
-            "queries": [{
-                "name": "main_query",
-                "query": {
-                    "datasetName": dataset_name,
-                    "fields": [
-                        self._create_field(value_name, value_expr)
-                    ],
-                    "disaggregated": False
+            value_name = sys.intern(f"{value_agg.lower()}({value_field})")
+            value_expr = f"{value_agg}({_qident(value_field)})"
+
+        fields = [self._create_field(value_name, value_expr)]
+
+        widget = self._main_query_widget(widget_id, dataset_name, fields, {
+            "version": 2,
+            "widgetType": "counter",
+            "encodings": {
+                "value": {
+                    "fieldName": value_name,
+                    "displayName": title or value_name
                 }
-            }],
-            "spec": {
-                "version": 2,
-                "widgetType": "counter",
-                "encodings": {
-                    "value": {
-                        "fieldName": value_name,
-                        "displayName": title or value_name
-                    }
-                },
-                "frame": {
-                    "showTitle": title is not None,
-                    "title": title or ""
-                }
-            }
-        }
+            },
+            "frame": _frame(title)
+        })
 
-        self._add_widget(widget, position or {"x": 0, "y": 0, "width": 1, "height": 2})
+        self._add_widget(widget, position, _DEFAULT_POS_COUNTER)
         return widget_id
 
     def add_scatter_plot(
@@ -438,9 +512,9 @@ class LakeviewDashboard:
         x_field: str,
         y_field: str,
         title: Optional[str] = None,
-        position: Optional[Dict[str, int]] = None,
+        position: Optional[dict[str, int]] = None,
         color_field: Optional[str] = None,
-        colors: Optional[List[str]] = None
+        colors: Optional[list[str]] = None
     ) -> str:
         """Add a scatter plot widget.
 
@@ -459,68 +533,42 @@ class LakeviewDashboard:
         widget_id = self._generate_id()
 
         fields = [
-            self._create_field(x_field, f"`{x_field}`"),
-            self._create_field(y_field, f"`{y_field}`")
+            self._create_field(x_field, _qident(x_field)),
+            self._create_field(y_field, _qident(y_field))
         ]
 
         if color_field:
-            fields.append(self._create_field(color_field, f"`{color_field}`"))
-
-        encodings = {
-            "x": {
-                "fieldName": x_field,
-                "scale": {"type": "quantitative"},
-                "displayName": x_field
-            },
-            "y": {
-                "fieldName": y_field,
-                "scale": {"type": "quantitative"},
-                "displayName": y_field
-            }
-        }
+            fields.append(self._create_field(color_field, _qident(color_field)))
 
-        if color_field:
-            encodings["color"] = {
-                "fieldName": color_field,
-                "scale": {"type": "categorical"},
-                "displayName": color_field
-            }
+        encodings = self._build_encodings(
+            x_field, x_field, _QUANT_SCALE,
+            y_field, y_field,
+            color_field=color_field,
+        )
 
         spec = {
             "version": 3,
             "widgetType": "scatter",
             "encodings": encodings,
-            "frame": {
-                "showTitle": title is not None,
-                "title": title or ""
-            }
+            "frame": _frame(title)
         }
 
         if colors:
             spec["mark"] = {"colors": colors}
 
-        widget = {
-            "name": widget_id,
-            "queries": [{
-                "name": "main_query",
-                "query": {
-                    "datasetName": dataset_name,
-                    "fields": fields,
-                    "disaggregated": True
-                }
-            }],
-            "spec": spec
-        }
+        widget = self._main_query_widget(
+            widget_id, dataset_name, fields, spec, disaggregated=True
+        )
 
-        self._add_widget(widget, position or {"x": 0, "y": 0, "width": 3, "height": 4})
+        self._add_widget(widget, position, _DEFAULT_POS_CHART)
         return widget_id
 
     def add_table(
         self,
         dataset_name: str,
-        columns: List[Dict[str, Any]],
+        columns: list[dict[str, Any]],
         title: Optional[str] = None,
-        position: Optional[Dict[str, int]] = None
+        position: Optional[dict[str, int]] = None
     ) -> str:
         """Add a table widget.
 
@@ -539,63 +587,24 @@ class LakeviewDashboard:
         """
         widget_id = self._generate_id()
 
-        fields = []
-        column_encodings = []
-
-        for i, col in enumerate(columns):
-            field_name = col["field"]
-            fields.append(self._create_field(field_name, f"`{field_name}`"))
-
-            col_type = col.get("type", "string")
-            display_as = "string"
-            align = "left"
-
-            if col_type in ("integer", "float"):
-                display_as = "number"
-                align = "right"
-            elif col_type == "datetime":
-                display_as = "datetime"
-                align = "right"
-
-            encoding = {
-                "fieldName": field_name,
-                "type": col_type,
-                "displayAs": display_as,
-                "title": col.get("title", field_name),
-                "displayName": col.get("title", field_name),
-                "order": 100000 + i,
-                "alignContent": align
-            }
-
-            if "format" in col and col_type in ("integer", "float"):
-                encoding["numberFormat"] = col["format"]
-
-            column_encodings.append(encoding)
+        fields = [
+            self._create_field(col["field"], _qident(col["field"]))
+            for col in columns
+        ]
+        column_encodings = [
+            _column_encoding(i, col) for i, col in enumerate(columns)
+        ]
 
-        widget = {
-            "name": widget_id,
-            "queries": [{
-                "name": "main_query",
-                "query": {
-                    "datasetName": dataset_name,
-                    "fields": fields,
-                    "disaggregated": True
-                }
-            }],
-            "spec": {
-                "version": 1,
-                "widgetType": "table",
-                "encodings": {
-                    "columns": column_encodings
-                },
-                "frame": {
-                    "showTitle": title is not None,
-                    "title": title or ""
-                }
-            }
-        }
+        widget = self._main_query_widget(widget_id, dataset_name, fields, {
+            "version": 1,
+            "widgetType": "table",
+            "encodings": {
+                "columns": column_encodings
+            },
+            "frame": _frame(title)
+        }, disaggregated=True)
 
-        self._add_widget(widget, position or {"x": 0, "y": 0, "width": 6, "height": 5})
+        self._add_widget(widget, position, _DEFAULT_POS_TABLE)
         return widget_id
 
     def add_filter_dropdown(
@@ -603,7 +612,7 @@ class LakeviewDashboard:
         dataset_name: str,
         field: str,
         title: Optional[str] = None,
-        position: Optional[Dict[str, int]] = None,
+        position: Optional[dict[str, int]] = None,
         multi_select: bool = False
     ) -> str:
         """Add a dropdown filter widget.
@@ -630,7 +639,7 @@ class LakeviewDashboard:
                 "query": {
                     "datasetName": dataset_name,
                     "fields": [
-                        self._create_field(field, f"`{field}`"),
+                        self._create_field(field, _qident(field)),
                         self._create_field(f"{field}_associativity", 'COUNT_IF(`associative_filter_predicate_group`)')
                     ],
                     "disaggregated": False
@@ -653,35 +662,120 @@ class LakeviewDashboard:
             }
         }
 
-        self._add_widget(widget, position or {"x": 0, "y": 0, "width": 1, "height": 2})
+        self._add_widget(widget, position, _DEFAULT_POS_FILTER)
+        return widget_id
+
+    def add_global_filter_dropdown(
+        self,
+        pairs: list[tuple[str, str]],
+        title: Optional[str] = None,
+        position: Optional[dict[str, int]] = None,
+        multi_select: bool = False
+    ) -> str:
+        """Add a dropdown filter bound to multiple (dataset, field) pairs.
+
+        Listing a narrow dimension dataset first keeps the dropdown's value
+        list cheap to populate while still filtering the fact datasets.
+
+        Args:
+            pairs: List of (dataset_name, field_name) tuples
+            title: Filter title
+            position: Position dict
+            multi_select: Allow multiple selections
+
+        Returns:
+            The widget ID
+        """
+        widget_id = self._generate_id()
+        widget_type = "filter-multi-select" if multi_select else "filter-single-select"
+
+        queries = []
+        field_encodings = []
+        for ds, fld in pairs:
+            query_name = f"filter_{widget_id}_{ds}_{fld}"
+            queries.append({
+                "name": query_name,
+                "query": {
+                    "datasetName": ds,
+                    "fields": [
+                        self._create_field(fld, _qident(fld)),
+                        self._create_field(f"{fld}_associativity", 'COUNT_IF(`associative_filter_predicate_group`)')
+                    ],
+                    "disaggregated": False
+                }
+            })
+            field_encodings.append({
+                "fieldName": fld,
+                "displayName": fld,
+                "queryName": query_name
+            })
+
+        widget = {
+            "name": widget_id,
+            "queries": queries,
+            "spec": {
+                "version": 2,
+                "widgetType": widget_type,
+                "encodings": {
+                    "fields": field_encodings
+                },
+                "frame": {
+                    "showTitle": title is not None,
+                    "title": title or f"Filter by {pairs[0][1]}"
+                }
+            }
+        }
+
+        self._add_widget(widget, position, _DEFAULT_POS_FILTER)
         return widget_id
 
     def add_date_filter(
         self,
-        dataset_name,
+        dataset_name: str,
         field: str,
         title: Optional[str] = None,
-        position: Optional[Dict[str, int]] = None
+        position: Optional[dict[str, int]] = None
     ) -> str:
-        """Add a date range picker filter widget.
+        """Add a date range picker filter widget for a single dataset.
 
         Args:
-            dataset_name: Single dataset name (str) or list of
-                (dataset_name, field_name) tuples for a global filter
-            field: Date field to filter on (used when dataset_name is a str)
+            dataset_name: Name of the dataset to use
+            field: Date field to filter on
             title: Filter title
             position: Position dict
 
         Returns:
             The widget ID
         """
-        widget_id = self._generate_id()
+        return self._add_date_filter_impl([(dataset_name, field)], field, title, position)
 
-        # Normalize to list of (dataset, field) pairs
-        if isinstance(dataset_name, str):
-            pairs = [(dataset_name, field)]
-        else:
-            pairs = dataset_name
+    def add_global_date_filter(
+        self,
+        pairs: list[tuple[str, str]],
+        title: Optional[str] = None,
+        position: Optional[dict[str, int]] = None
+    ) -> str:
+        """Add a date range picker filter spanning multiple datasets.
+
+        Args:
+            pairs: List of (dataset_name, field_name) tuples
+            title: Filter title
+            position: Position dict
+
+        Returns:
+            The widget ID
+        """
+        return self._add_date_filter_impl(pairs, pairs[0][1], title, position)
+
+    def _add_date_filter_impl(
+        self,
+        pairs: list[tuple[str, str]],
+        title_field: str,
+        title: Optional[str],
+        position: Optional[dict[str, int]]
+    ) -> str:
+        """Build a date range picker over pre-normalized (dataset, field) pairs."""
+        widget_id = self._generate_id()
 
         queries = []
         field_encodings = []
@@ -692,7 +786,7 @@ class LakeviewDashboard:
                 "query": {
                     "datasetName": ds,
                     "fields": [
-                        self._create_field(fld, f"`{fld}`"),
+                        self._create_field(fld, _qident(fld)),
                         self._create_field(f"{fld}_associativity", 'COUNT_IF(`associative_filter_predicate_group`)')
                     ],
                     "disaggregated": False
@@ -715,29 +809,75 @@ class LakeviewDashboard:
                 },
                 "frame": {
                     "showTitle": title is not None,
-                    "title": title or f"Select {field}"
+                    "title": title or f"Select {title_field}"
                 }
             }
         }
 
-        self._add_widget(widget, position or {"x": 0, "y": 0, "width": 1, "height": 2})
+        self._add_widget(widget, position, _DEFAULT_POS_FILTER)
         return widget_id
 
-    def to_dict(self) -> Dict:
+    def add_widgets(self, specs: list[dict]) -> list[str]:
+        """Add multiple widgets from declarative specs in one call.
+
+        Each spec carries a "type" key (bar, line, pie, counter, scatter,
+        table, filter_dropdown, date_filter) plus the keyword arguments of
+        the corresponding add_* method. Dispatch happens once through a
+        local table, amortizing method lookup across the batch.
+
+        Args:
+            specs: List of widget spec dicts
+
+        Returns:
+            Widget IDs in input order
+        """
+        dispatch = {
+            "bar": self.add_bar_chart,
+            "line": self.add_line_chart,
+            "pie": self.add_pie_chart,
+            "counter": self.add_counter,
+            "scatter": self.add_scatter_plot,
+            "table": self.add_table,
+            "filter_dropdown": self.add_filter_dropdown,
+            "date_filter": self.add_date_filter,
+        }
+
+        widget_ids = []
+        for spec in specs:
+            kwargs = dict(spec)
+            widget_type = kwargs.pop("type")
+            try:
+                method = dispatch[widget_type]
+            except KeyError:
+                raise ValueError(f"Unknown widget type: {widget_type!r}") from None
+            widget_ids.append(method(**kwargs))
+        return widget_ids
+
+    def to_dict(self) -> dict:
         """Convert dashboard to dictionary format.
 
         Returns:
             Dictionary representation of the dashboard
         """
+        pages = [
+            {
+                "name": page["name"],
+                "displayName": page["displayName"],
+                "pageType": page["pageType"],
+                "layout": [
+                    {
+                        "widget": widget,
+                        "position": {"x": x, "y": y, "width": width, "height": height}
+                    }
+                    for widget, x, y, width, height in page["layout"]
+                ]
+            }
+            for page in self.pages
+        ]
         return {
             "datasets": self.datasets,
-            "pages": self.pages,
-            "uiSettings": {
-                "theme": {
-                    "widgetHeaderAlignment": "ALIGNMENT_UNSPECIFIED"
-                },
-                "applyModeEnabled": False
-            }
+            "pages": pages,
+            "uiSettings": _UI_SETTINGS
         }
 
     def to_json(self, indent: int = 2) -> str:
@@ -749,9 +889,57 @@ class LakeviewDashboard:
         Returns:
             JSON string for the serialized_dashboard field
         """
+        # Callers often need both to_json() and get_api_payload(); reuse the
+        # serialized form until the next add_* mutation.
+        if self._cached_json is not None and self._cached_json[0] == indent:
+            return self._cached_json[1]
+        self._cached_json = (indent, self._to_json_uncached(indent))
+        return self._cached_json[1]
+
+    def _to_json_uncached(self, indent: int) -> str:
+        if orjson is not None:
+            option = orjson.OPT_INDENT_2 if indent else 0
+            return orjson.dumps(self.to_dict(), option=option).decode()
+        if not indent:
+            # Compact separators skip the per-token space emission
+            return json.dumps(self.to_dict(), separators=(",", ":"))
         return json.dumps(self.to_dict(), indent=indent)
 
-    def get_api_payload(self, warehouse_id: str, parent_path: str) -> Dict:
+    def dump(self, fp, indent: int = 2) -> None:
+        """Serialize the dashboard directly to a file-like object.
+
+        Streams via json.dump instead of materializing the full JSON string,
+        halving peak memory for large dashboards written to disk.
+
+        Args:
+            fp: Writable text-mode file object
+            indent: JSON indentation level
+        """
+        json.dump(self.to_dict(), fp, indent=indent)
+
+    def write_api_payload(self, fp, warehouse_id: str, parent_path: str) -> None:
+        """Stream the full create-dashboard API payload to a file-like object.
+
+        Writes the envelope field by field so the doubled payload (envelope
+        plus embedded serialized_dashboard string) never exists in memory
+        at once.
+
+        Args:
+            fp: Writable text-mode file object
+            warehouse_id: SQL warehouse ID
+            parent_path: Path where dashboard will be created
+        """
+        fp.write('{"display_name": ')
+        json.dump(self.name, fp)
+        fp.write(', "warehouse_id": ')
+        json.dump(warehouse_id, fp)
+        fp.write(', "parent_path": ')
+        json.dump(parent_path, fp)
+        fp.write(', "serialized_dashboard": ')
+        json.dump(self.to_json(), fp)
+        fp.write('}')
+
+    def get_api_payload(self, warehouse_id: str, parent_path: str) -> dict:
         """Get the full API payload for creating the dashboard.
 
         Args:
@@ -768,6 +956,29 @@ class LakeviewDashboard:
             "serialized_dashboard": self.to_json()
         }
 
+    def get_api_payload_raw(self, warehouse_id: str, parent_path: str) -> dict:
+        """Get the API payload with the dashboard as a nested dict.
+
+        Unlike get_api_payload, serialized_dashboard is left as a dict so an
+        HTTP client that serializes the request body anyway does exactly one
+        JSON pass instead of encoding the dashboard twice. Callers that need
+        the string form (the Lakeview API expects one) should keep using
+        get_api_payload.
+
+        Args:
+            warehouse_id: SQL warehouse ID
+            parent_path: Path where dashboard will be created
+
+        Returns:
+            API payload dictionary with an unserialized dashboard spec
+        """
+        return {
+            "display_name": self.name,
+            "warehouse_id": warehouse_id,
+            "parent_path": parent_path,
+            "serialized_dashboard": self.to_dict()
+        }
+
 
 if __name__ == "__main__":
     # Example usage
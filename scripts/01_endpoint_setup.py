@@ -13,25 +13,23 @@ Usage:
     python scripts/01_endpoint_setup.py --config config.yaml
 """
 
+from __future__ import annotations
+
 import argparse
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
 from pathlib import Path
-import yaml
-from databricks.sdk import WorkspaceClient
-from databricks.sdk.service.serving import (
-    AiGatewayConfig,
-    AiGatewayInferenceTableConfig,
-    EndpointCoreConfigInput,
-    EndpointStateReady,
-    ServedEntityInput,
-)
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
-from uc_model_version import resolve_latest_ready_model_version
+
+# Heavy imports (databricks.sdk, yaml) are deferred into the functions that
+# need them so `--help` and argparse errors don't pay SDK startup cost.
 
 
 def load_config(config_path: str) -> dict:
+    import yaml
+
     with open(config_path) as f:
         return yaml.safe_load(f)
 
@@ -42,18 +40,28 @@ def create_endpoint(
     entity_name: str,
     catalog: str,
     schema: str,
+    exists: bool = False,
     timeout_minutes: int = 20,
 ):
     """Create a serving endpoint with AI Gateway and inference tables enabled."""
+    from databricks.sdk.service.serving import (
+        AiGatewayConfig,
+        AiGatewayInferenceTableConfig,
+        EndpointCoreConfigInput,
+        EndpointStateReady,
+        ServedEntityInput,
+    )
+    from uc_model_version import resolve_latest_ready_model_version
 
-    # Check if endpoint already exists
-    try:
+    # The caller already knows whether the endpoint exists (one list() call
+    # in main), so no per-endpoint get-or-404 round trip here.
+    if exists:
         existing = client.serving_endpoints.get(endpoint_name)
         print(f"  Endpoint '{endpoint_name}' already exists (state: {existing.state.ready})")
         if existing.state.ready == EndpointStateReady.READY:
             return existing
-        print(f"  Waiting for existing endpoint to become READY...")
-    except Exception:
+        print(f"  [{endpoint_name}] Waiting for existing endpoint to become READY...")
+    else:
         entity_version = resolve_latest_ready_model_version(client, entity_name)
         print(
             f"  Creating endpoint '{endpoint_name}' with entity '{entity_name}' "
@@ -80,25 +88,24 @@ def create_endpoint(
             ),
         )
 
-    # Wait for READY state
-    start = time.time()
-    while time.time() - start < timeout_minutes * 60:
-        ep = client.serving_endpoints.get(endpoint_name)
-        ready = ep.state.ready
-        if ready == EndpointStateReady.READY:
-            print(f"  Endpoint '{endpoint_name}' is READY")
-            return ep
-        if ready == EndpointStateReady.NOT_READY:
-            config_state = str(ep.state.config_update) if ep.state.config_update else "PENDING"
-            elapsed = int(time.time() - start)
-            print(f"  Waiting... ({elapsed}s, config: {config_state})")
-            time.sleep(30)
-            continue
-        print(f"  Unexpected state: {ready!r}")
-        time.sleep(15)
-
-    print(f"  TIMEOUT: Endpoint '{endpoint_name}' did not reach READY in {timeout_minutes} min")
-    sys.exit(1)
+    # Delegate the readiness wait to the SDK helper, which handles the poll
+    # interval internally instead of this script re-fetching the endpoint
+    try:
+        ep = client.serving_endpoints.wait_get_serving_endpoint_not_updating(
+            endpoint_name, timeout=timedelta(minutes=timeout_minutes)
+        )
+    except TimeoutError:
+        raise RuntimeError(
+            f"Endpoint '{endpoint_name}' did not reach READY in {timeout_minutes} min"
+        ) from None
+
+    if ep.state.ready == EndpointStateReady.READY:
+        print(f"  Endpoint '{endpoint_name}' is READY")
+        return ep
+    raise RuntimeError(
+        f"Endpoint '{endpoint_name}' finished updating but is not READY "
+        f"(state: {ep.state.ready})"
+    )
 
 
 def create_ground_truth_table(client: WorkspaceClient, catalog: str, schema: str):
@@ -107,16 +114,18 @@ def create_ground_truth_table(client: WorkspaceClient, catalog: str, schema: str
 
     full_table = f"{catalog}.{schema}.evaluation_ground_truth"
 
-    # Use SQL via the statement execution API
+    # Use SQL via the statement execution API. The statements are
+    # order-dependent (schema -> table -> rows), so they run sequentially;
+    # CREATE OR REPLACE collapses the old create+truncate pair into one
+    # round trip, and the INSERT stays a single multi-row VALUES batch.
     sql_statements = [
         f"CREATE SCHEMA IF NOT EXISTS {catalog}.{schema}",
-        f"""CREATE TABLE IF NOT EXISTS {full_table} (
+        f"""CREATE OR REPLACE TABLE {full_table} (
             prompt STRING,
             expected_response STRING,
             quality_score DOUBLE,
             category STRING
         ) USING DELTA""",
-        f"TRUNCATE TABLE {full_table}",
         f"""INSERT INTO {full_table} VALUES
             ('Summarize the key benefits of a unified data platform.',
              'A unified data platform consolidates data engineering, analytics, and AI on one platform, reducing complexity, improving governance, and lowering costs.',
@@ -161,6 +170,8 @@ def main():
     global config
     config = load_config(args.config)
 
+    from databricks.sdk import WorkspaceClient
+
     # Initialize client
     client = WorkspaceClient(
         host=config["workspace_host"],
@@ -176,6 +187,7 @@ def main():
     print("=" * 60)
     print("SCENE 2: One Gateway, Every Model")
     print("Creating endpoints for all three major model families")
+    print("(plus Claude Opus 4.5 for the Scene 4 A/B test)")
     print("=" * 60)
 
     # UC requires catalog.schema.model (foundation models live under system.ai)
@@ -184,25 +196,40 @@ def main():
         (endpoints_cfg["gpt_5_2"], "system.ai.databricks-gpt-5-2"),
         (endpoints_cfg["gemini_3_1_pro"], "system.ai.databricks-gemini-3-1-pro"),
     ]
+    all_endpoints = headline_endpoints + [
+        (endpoints_cfg["claude_opus_4_5"], "system.ai.databricks-claude-opus-4-5"),
+    ]
 
-    for ep_name, entity_name in headline_endpoints:
-        print(f"\n[{entity_name}]")
-        create_endpoint(client, ep_name, entity_name, catalog, schema)
-
-    # --- Version optionality: Opus 4.5 for A/B test ---
-    print("\n" + "=" * 60)
-    print("SCENE 4: Version Optionality (A/B Test)")
-    print("Creating Claude Opus 4.5 for side-by-side comparison")
-    print("=" * 60)
-
-    print(f"\n[system.ai.databricks-claude-opus-4-5]")
-    create_endpoint(
-        client,
-        endpoints_cfg["claude_opus_4_5"],
-        "system.ai.databricks-claude-opus-4-5",
-        catalog,
-        schema,
-    )
+    # One list() call answers "which endpoints already exist" for all four,
+    # instead of a get-or-404 round trip per endpoint.
+    existing_names = {e.name for e in client.serving_endpoints.list()}
+
+    # The endpoints are independent, so create and wait for all of them in
+    # parallel: total wall time is the slowest endpoint, not the sum.
+    failures = []
+    with ThreadPoolExecutor(max_workers=len(all_endpoints)) as executor:
+        futures = {
+            executor.submit(
+                create_endpoint,
+                client,
+                ep_name,
+                entity_name,
+                catalog,
+                schema,
+                exists=ep_name in existing_names,
+            ): ep_name
+            for ep_name, entity_name in all_endpoints
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failures.append((futures[future], e))
+
+    if failures:
+        for ep_name, e in failures:
+            print(f"\nERROR: {ep_name}: {e}")
+        sys.exit(1)
 
     # --- Ground truth table for evaluation demo ---
     create_ground_truth_table(client, catalog, schema)
@@ -11,22 +11,38 @@ Usage:
     python scripts/02_test_requests.py --batch --count 50  # Custom batch size
 """
 
+from __future__ import annotations
+
 import argparse
+import asyncio
 import json
 import subprocess
 import sys
+import threading
 import time
-import yaml
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from openai import OpenAI
-from tabulate import tabulate
+from itertools import cycle, islice
+
+# Heavy imports (openai, httpx, yaml) are deferred into the functions that
+# need them so `--help` and argparse errors don't pay SDK startup cost.
 
 
 def load_config(config_path: str) -> dict:
+    import yaml
+
     with open(config_path) as f:
         return yaml.safe_load(f)
 
 
+PROVIDER_MAP = {"claude": "Anthropic", "gpt": "OpenAI", "gemini": "Google"}
+
+
+def provider_of(endpoint_name: str) -> str:
+    """Classify an endpoint name into a model-family provider."""
+    lowered = endpoint_name.lower()
+    return next((v for k, v in PROVIDER_MAP.items() if k in lowered), "unknown")
+
+
 DEMO_PROMPT = (
     "In exactly 2-3 sentences, explain why a unified data platform "
     "is better than managing separate tools for data engineering, "
@@ -57,9 +73,37 @@ BATCH_PROMPTS = [
 ]
 
 
+def _success_result(endpoint_name: str, response, elapsed: float) -> dict:
+    content = response.choices[0].message.content
+    if isinstance(content, list):
+        content = " ".join(
+            c.get("text", "") if isinstance(c, dict) else str(c)
+            for c in content
+        )
+    return {
+        "endpoint": endpoint_name,
+        "response": content.strip(),
+        "tokens_in": response.usage.prompt_tokens,
+        "tokens_out": response.usage.completion_tokens,
+        "latency_s": round(elapsed, 2),
+        "status": "OK",
+    }
+
+
+def _error_result(endpoint_name: str, e: Exception, elapsed: float) -> dict:
+    return {
+        "endpoint": endpoint_name,
+        "response": str(e)[:100],
+        "tokens_in": 0,
+        "tokens_out": 0,
+        "latency_s": round(elapsed, 2),
+        "status": "ERROR",
+    }
+
+
 def send_request(client: OpenAI, endpoint_name: str, prompt: str) -> dict:
     """Send a single chat completion request and return timing + response."""
-    start = time.time()
+    start = time.perf_counter()
     try:
         response = client.chat.completions.create(
             model=endpoint_name,
@@ -67,31 +111,66 @@ def send_request(client: OpenAI, endpoint_name: str, prompt: str) -> dict:
             max_tokens=2048,
             temperature=0.7,
         )
-        elapsed = time.time() - start
-        content = response.choices[0].message.content
-        if isinstance(content, list):
-            content = " ".join(
-                c.get("text", "") if isinstance(c, dict) else str(c)
-                for c in content
-            )
+        return _success_result(endpoint_name, response, time.perf_counter() - start)
+    except Exception as e:
+        return _error_result(endpoint_name, e, time.perf_counter() - start)
+
+
+def send_request_streaming(
+    client: OpenAI, endpoint_name: str, prompt: str, print_lock: threading.Lock
+) -> dict:
+    """Stream a chat completion, announcing when the first token arrives."""
+    start = time.perf_counter()
+    first_token_s = None
+    parts = []
+    tokens_in = tokens_out = 0
+    try:
+        stream = client.chat.completions.create(
+            model=endpoint_name,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=2048,
+            temperature=0.7,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        for chunk in stream:
+            if chunk.usage:
+                tokens_in = chunk.usage.prompt_tokens
+                tokens_out = chunk.usage.completion_tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                if first_token_s is None:
+                    first_token_s = time.perf_counter() - start
+                    with print_lock:
+                        print(f"  [{endpoint_name}] first token after {first_token_s:.2f}s")
+                parts.append(chunk.choices[0].delta.content)
         return {
             "endpoint": endpoint_name,
-            "response": content.strip(),
-            "tokens_in": response.usage.prompt_tokens,
-            "tokens_out": response.usage.completion_tokens,
-            "latency_s": round(elapsed, 2),
+            "response": "".join(parts).strip(),
+            "tokens_in": tokens_in,
+            "tokens_out": tokens_out,
+            "first_token_s": round(first_token_s, 2) if first_token_s is not None else None,
+            "latency_s": round(time.perf_counter() - start, 2),
             "status": "OK",
         }
     except Exception as e:
-        elapsed = time.time() - start
-        return {
-            "endpoint": endpoint_name,
-            "response": str(e)[:100],
-            "tokens_in": 0,
-            "tokens_out": 0,
-            "latency_s": round(elapsed, 2),
-            "status": "ERROR",
-        }
+        result = _error_result(endpoint_name, e, time.perf_counter() - start)
+        result["first_token_s"] = None
+        return result
+
+
+async def send_request_async(client: AsyncOpenAI, endpoint_name: str, prompt: str) -> dict:
+    """Async variant of send_request."""
+    start = time.perf_counter()
+    try:
+        response = await client.chat.completions.create(
+            model=endpoint_name,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=2048,
+            temperature=0.7,
+        )
+        return _success_result(endpoint_name, response, time.perf_counter() - start)
+    except Exception as e:
+        return _error_result(endpoint_name, e, time.perf_counter() - start)
 
 
 def demo_side_by_side(client: OpenAI, endpoints: list[str]):
@@ -101,10 +180,14 @@ def demo_side_by_side(client: OpenAI, endpoints: list[str]):
     print(f"Prompt: \"{DEMO_PROMPT[:80]}...\"")
     print("=" * 70)
 
+    # Stream all three concurrently: the fastest model visibly answers first,
+    # and first-token latency is what the side-by-side moment is about.
+    print("\nStreaming from all three families...")
+    print_lock = threading.Lock()
     results = []
-    with ThreadPoolExecutor(max_workers=3) as executor:
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
         futures = {
-            executor.submit(send_request, client, ep, DEMO_PROMPT): ep
+            executor.submit(send_request_streaming, client, ep, DEMO_PROMPT, print_lock): ep
             for ep in endpoints
         }
         for future in as_completed(futures):
@@ -114,51 +197,61 @@ def demo_side_by_side(client: OpenAI, endpoints: list[str]):
     results.sort(key=lambda r: r["endpoint"])
 
     for r in results:
-        provider = "unknown"
-        if "claude" in r["endpoint"].lower():
-            provider = "Anthropic"
-        elif "gpt" in r["endpoint"].lower():
-            provider = "OpenAI"
-        elif "gemini" in r["endpoint"].lower():
-            provider = "Google"
-
-        print(f"\n--- {provider}: {r['endpoint']} ({r['latency_s']}s) ---")
+        provider = provider_of(r["endpoint"])
+        first = r.get("first_token_s")
+        timing = f"first token {first}s, total {r['latency_s']}s" if first else f"{r['latency_s']}s"
+        print(f"\n--- {provider}: {r['endpoint']} ({timing}) ---")
         print(r["response"][:300])
 
-    # Summary table
+    # Summary table — three rows don't need a table library
     print("\n" + "-" * 70)
-    table = [
-        [r["endpoint"], r["status"], r["tokens_in"], r["tokens_out"], r["latency_s"]]
-        for r in results
-    ]
-    print(tabulate(table, headers=["Endpoint", "Status", "In Tokens", "Out Tokens", "Latency (s)"]))
+    print(f"{'Endpoint':<40} {'Status':<7} {'In':>6} {'Out':>6} {'First (s)':>10} {'Total (s)':>10}")
+    for r in results:
+        first = str(r.get("first_token_s") or "-")
+        print(
+            f"{r['endpoint']:<40} {r['status']:<7} {r['tokens_in']:>6} "
+            f"{r['tokens_out']:>6} {first:>10} {r['latency_s']:>10}"
+        )
 
 
-def batch_requests(client: OpenAI, endpoints: list[str], count: int):
-    """Send many requests to populate system tables for the dashboard demo."""
+async def batch_requests(
+    client: AsyncOpenAI, endpoints: list[str], count: int, concurrency: int = 20
+):
+    """Send many requests to populate system tables for the dashboard demo.
+
+    The work is pure network I/O, so it runs on a fixed pool of asyncio
+    worker tasks drawing from a lazy (endpoint, prompt) iterator — peak
+    memory stays O(concurrency) instead of O(endpoints * count) pending
+    coroutines at large --count.
+    """
     print("=" * 70)
     print(f"BATCH MODE: Sending {count} requests per endpoint to populate system tables")
     print("=" * 70)
 
-    prompts = (BATCH_PROMPTS * ((count // len(BATCH_PROMPTS)) + 1))[:count]
     total = len(endpoints) * count
     completed = 0
     errors = 0
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = []
-        for ep in endpoints:
-            for prompt in prompts:
-                futures.append(executor.submit(send_request, client, ep, prompt))
+    # cycle/islice repeats the prompt list lazily instead of materializing
+    # a count-sized copy per endpoint
+    work = iter(
+        (ep, prompt)
+        for ep in endpoints
+        for prompt in islice(cycle(BATCH_PROMPTS), count)
+    )
 
-        for future in as_completed(futures):
-            result = future.result()
+    async def worker():
+        nonlocal completed, errors
+        for ep, prompt in work:
+            result = await send_request_async(client, ep, prompt)
             completed += 1
             if result["status"] != "OK":
                 errors += 1
             if completed % 10 == 0 or completed == total:
                 print(f"  Progress: {completed}/{total} (errors: {errors})")
 
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
     print(f"\nBatch complete: {completed} requests sent, {errors} errors")
     print("System tables will populate in 5-30 minutes.")
     print("Inference tables may take up to 1 hour.")
@@ -173,6 +266,13 @@ def main():
 
     config = load_config(args.config)
 
+    import httpx
+    from openai import AsyncOpenAI, OpenAI
+
+    # Shared connection-pool sizing: keep-alive amortizes TCP+TLS setup
+    # across the whole run instead of paying it per worker.
+    http_limits = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+
     # Get a fresh token via CLI profile (falls back to config token if profile unavailable)
     token = config.get("databricks_token") or None
     profile = config.get("databricks_cli_profile")
@@ -191,8 +291,15 @@ def main():
     client = OpenAI(
         base_url=f"{config['workspace_host']}/serving-endpoints",
         api_key=token,
+        http_client=httpx.Client(limits=http_limits, timeout=60.0),
     )
 
+    # Warm up the pool so the first timed request doesn't pay connection setup
+    try:
+        client.models.list()
+    except Exception:
+        pass
+
     endpoints_cfg = config["endpoints"]
     primary_endpoints = [
         endpoints_cfg["claude_opus_4_6"],
@@ -203,7 +310,19 @@ def main():
     if args.batch:
         # Batch mode: hit all endpoints including Opus 4.5
         all_endpoints = primary_endpoints + [endpoints_cfg["claude_opus_4_5"]]
-        batch_requests(client, all_endpoints, args.count)
+        async_client = AsyncOpenAI(
+            base_url=f"{config['workspace_host']}/serving-endpoints",
+            api_key=token,
+            http_client=httpx.AsyncClient(limits=http_limits, timeout=60.0),
+        )
+        asyncio.run(
+            batch_requests(
+                async_client,
+                all_endpoints,
+                args.count,
+                concurrency=config.get("concurrency", 20),
+            )
+        )
     else:
         # Demo mode: side-by-side comparison
         demo_side_by_side(client, primary_endpoints)
@@ -13,18 +13,22 @@ Usage:
     python scripts/03_ab_test_routing.py --config config.yaml
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import subprocess
 import sys
 import time
-import yaml
-from collections import Counter
-from openai import OpenAI
-from tabulate import tabulate
+from collections import defaultdict
+
+# Heavy imports (openai, httpx, yaml) are deferred into the functions that
+# need them so `--help` and argparse errors don't pay SDK startup cost.
 
 
 def load_config(config_path: str) -> dict:
+    import yaml
+
     with open(config_path) as f:
         return yaml.safe_load(f)
 
@@ -98,33 +102,34 @@ def create_ab_test_endpoint(config: dict):
 
     secret_ref = f"{{{{secrets/{secret_scope}/{secret_key}}}}}"
 
-    def build_served_entities():
-        return [
-            {
-                "name": "claude-opus-4-6",
-                "external_model": {
-                    "name": opus_46_endpoint,
-                    "provider": "databricks-model-serving",
-                    "task": "llm/v1/chat",
-                    "databricks_model_serving_config": {
-                        "databricks_workspace_url": workspace_host,
-                        "databricks_api_token": secret_ref,
-                    },
+    # Built once and shared by both the update and create payloads below,
+    # so the two paths can't drift apart.
+    served_entities = [
+        {
+            "name": "claude-opus-4-6",
+            "external_model": {
+                "name": opus_46_endpoint,
+                "provider": "databricks-model-serving",
+                "task": "llm/v1/chat",
+                "databricks_model_serving_config": {
+                    "databricks_workspace_url": workspace_host,
+                    "databricks_api_token": secret_ref,
                 },
             },
-            {
-                "name": "claude-opus-4-5",
-                "external_model": {
-                    "name": opus_45_endpoint,
-                    "provider": "databricks-model-serving",
-                    "task": "llm/v1/chat",
-                    "databricks_model_serving_config": {
-                        "databricks_workspace_url": workspace_host,
-                        "databricks_api_token": secret_ref,
-                    },
+        },
+        {
+            "name": "claude-opus-4-5",
+            "external_model": {
+                "name": opus_45_endpoint,
+                "provider": "databricks-model-serving",
+                "task": "llm/v1/chat",
+                "databricks_model_serving_config": {
+                    "databricks_workspace_url": workspace_host,
+                    "databricks_api_token": secret_ref,
                 },
             },
-        ]
+        },
+    ]
 
     traffic_config = {
         "routes": [
@@ -139,7 +144,7 @@ def create_ab_test_endpoint(config: dict):
     if "error" not in existing:
         print(f"\nEndpoint '{endpoint_name}' exists — updating config...")
         payload = {
-            "served_entities": build_served_entities(),
+            "served_entities": served_entities,
             "traffic_config": traffic_config,
         }
         result = run_databricks_api(
@@ -150,7 +155,7 @@ def create_ab_test_endpoint(config: dict):
         payload = {
             "name": endpoint_name,
             "config": {
-                "served_entities": build_served_entities(),
+                "served_entities": served_entities,
                 "traffic_config": traffic_config,
             },
             "ai_gateway": {
@@ -173,16 +178,30 @@ def create_ab_test_endpoint(config: dict):
         print("Endpoint is READY!")
 
 
-def send_ab_test_requests(config: dict, count: int = 20):
-    """Send requests through the A/B endpoint and show routing distribution."""
+def send_ab_test_requests(config: dict, count: int = 20, use_cache: bool = False):
+    """Send requests through the A/B endpoint and show routing distribution.
+
+    With ``use_cache`` a repeated (endpoint, prompt, max_tokens) reuses the
+    first response instead of paying inference again. Cached requests never
+    reach the gateway, so the routing distribution only reflects the actual
+    API calls — hence off by default.
+    """
+    import httpx
+    from openai import OpenAI
+
     endpoint_name = config["endpoints"]["ab_test"]
     profile = config["databricks_cli_profile"]
 
     # Use a fresh token for requests
     token = get_fresh_token(profile)
+    # Pooled keep-alive transport: all count requests reuse one TLS connection
     client = OpenAI(
         base_url=f"{config['workspace_host']}/serving-endpoints",
         api_key=token,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+            timeout=60.0,
+        ),
     )
 
     print(f"\n--- Sending {count} requests through A/B endpoint ---")
@@ -195,17 +214,35 @@ def send_ab_test_requests(config: dict, count: int = 20):
         "Explain vector search briefly.",
     ]
 
-    results = []
+    cache: dict[tuple[str, str, int], dict] = {}
+    # Per-model [count, latency_sum, latency_min, latency_max], updated as
+    # responses arrive — one pass instead of re-scanning a results list.
+    stats: dict[str, list] = defaultdict(lambda: [0, 0.0, float("inf"), 0.0])
+
+    def record(model: str, latency: float):
+        s = stats[model]
+        s[0] += 1
+        s[1] += latency
+        s[2] = min(s[2], latency)
+        s[3] = max(s[3], latency)
+
     for i in range(count):
         prompt = prompts[i % len(prompts)]
-        start = time.time()
+        cache_key = (endpoint_name, prompt, 100)
+        if use_cache and cache_key in cache:
+            hit = cache[cache_key]
+            record(hit["model"], hit["latency"])
+            if (i + 1) % 5 == 0:
+                print(f"  Sent {i + 1}/{count}")
+            continue
+        start = time.perf_counter()
         try:
             response = client.chat.completions.create(
                 model=endpoint_name,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=100,
             )
-            elapsed = time.time() - start
+            elapsed = time.perf_counter() - start
             model_used = response.model or "unknown"
             # Simplify model name for display
             if "opus-4-6" in model_used:
@@ -215,50 +252,97 @@ def send_ab_test_requests(config: dict, count: int = 20):
             else:
                 display_name = model_used
 
-            results.append({
-                "request": i + 1,
-                "model": display_name,
-                "latency": round(elapsed, 2),
-                "tokens": response.usage.completion_tokens,
-            })
-        except Exception as e:
-            results.append({
-                "request": i + 1,
-                "model": "ERROR",
-                "latency": round(time.time() - start, 2),
-                "tokens": 0,
-            })
+            latency = round(elapsed, 2)
+            record(display_name, latency)
+            if use_cache:
+                cache[cache_key] = {"model": display_name, "latency": latency}
+        except Exception:
+            record("ERROR", round(time.perf_counter() - start, 2))
 
         if (i + 1) % 5 == 0:
             print(f"  Sent {i + 1}/{count}")
 
     # Show distribution
-    model_counts = Counter(r["model"] for r in results)
     print(f"\n--- Routing Distribution ---")
-    for model, cnt in model_counts.most_common():
-        pct = (cnt / len(results)) * 100
+    for model, (cnt, _, _, _) in sorted(stats.items(), key=lambda kv: -kv[1][0]):
+        pct = (cnt / count) * 100
         print(f"  {model}: {cnt} requests ({pct:.0f}%)")
 
     # Show latency comparison
     print(f"\n--- Latency by Model ---")
-    for model in model_counts:
+    for model, (cnt, lat_sum, lat_min, lat_max) in stats.items():
         if model == "ERROR":
             continue
-        latencies = [r["latency"] for r in results if r["model"] == model]
-        if latencies:
-            avg = sum(latencies) / len(latencies)
-            print(f"  {model}: avg={avg:.2f}s, min={min(latencies):.2f}s, max={max(latencies):.2f}s")
+        avg = lat_sum / cnt
+        print(f"  {model}: avg={avg:.2f}s, min={lat_min:.2f}s, max={lat_max:.2f}s")
 
     print(f"\nRouting information will appear in system.ai_gateway.usage within 5-30 minutes.")
     print(f"Query: SELECT routing_information FROM system.ai_gateway.usage")
     print(f"       WHERE endpoint_name = '{endpoint_name}'")
 
 
+def verify_routing_from_table(config: dict):
+    """Query system.ai_gateway.usage for the server-side routing distribution.
+
+    This is the authoritative count, but the system table lags live traffic
+    by 5-30 minutes — so it complements rather than replaces the in-loop
+    response.model bookkeeping that makes the demo work in real time.
+    """
+    endpoint_name = config["endpoints"]["ab_test"]
+    profile = config["databricks_cli_profile"]
+
+    statement = (
+        "SELECT routing_information, count(*) AS requests "
+        "FROM system.ai_gateway.usage "
+        f"WHERE endpoint_name = '{endpoint_name}' "
+        "AND event_time > now() - INTERVAL 1 HOUR "
+        "GROUP BY routing_information"
+    )
+    result = run_databricks_api(
+        "post",
+        "/api/2.0/sql/statements",
+        profile,
+        {
+            "warehouse_id": config.get("sql_warehouse_id", ""),
+            "statement": statement,
+            "wait_timeout": "50s",
+        },
+    )
+    if "error" in result:
+        print(f"Error querying usage table: {result['error']}")
+        return
+
+    # Statement errors come back as HTTP 200 with status.state FAILED —
+    # surface them instead of reading an empty result as table lag
+    status = result.get("status") or {}
+    if status.get("state") != "SUCCEEDED":
+        message = (status.get("error") or {}).get("message", "unknown error")
+        print(f"Error querying usage table ({status.get('state')}): {message}")
+        return
+
+    rows = (result.get("result") or {}).get("data_array") or []
+    print("\n--- Routing distribution (system.ai_gateway.usage, last hour) ---")
+    if not rows:
+        print("  No rows yet — the usage table lags live traffic by 5-30 minutes.")
+    for routing_info, cnt in rows:
+        print(f"  {routing_info}: {cnt} requests")
+
+
 def main():
     parser = argparse.ArgumentParser(description="A/B test routing demo")
     parser.add_argument("--config", default="config.yaml", help="Config file path")
     parser.add_argument("--count", type=int, default=20, help="Number of test requests")
     parser.add_argument("--skip-create", action="store_true", help="Skip endpoint creation, just send requests")
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse responses for repeated prompts (skews routing distribution)",
+    )
+    parser.add_argument(
+        "--verify-table",
+        action="store_true",
+        help="Also query system.ai_gateway.usage for the logged routing distribution",
+    )
     args = parser.parse_args()
 
     config = load_config(args.config)
@@ -266,7 +350,10 @@ def main():
     if not args.skip_create:
         create_ab_test_endpoint(config)
 
-    send_ab_test_requests(config, args.count)
+    send_ab_test_requests(config, args.count, use_cache=args.cache)
+
+    if args.verify_table:
+        verify_routing_from_table(config)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Build and deploy the FMAPI Unified Dashboard in one process.
+
+The dict from build_dashboard() goes straight into the deploy payload,
+skipping the build-encode -> write -> read -> decode round trip through
+dashboard/fmapi_unified_dashboard.json.
+
+Usage:
+    python scripts/build_and_deploy.py --config config.yaml
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from build_dashboard import build_dashboard
+from deploy_dashboard import deploy_dashboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and deploy the FMAPI Unified Dashboard")
+    parser.add_argument("--config", default="config.yaml", help="Config file path")
+    parser.add_argument("--name", default="FMAPI Unified Dashboard", help="Dashboard display name")
+    args = parser.parse_args()
+
+    import yaml
+
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+
+    deploy_dashboard(
+        config["databricks_cli_profile"],
+        config["sql_warehouse_id"],
+        config["dashboard_parent_path"],
+        args.name,
+        dashboard_dict=build_dashboard(),
+    )
+
+
+if __name__ == "__main__":
+    main()
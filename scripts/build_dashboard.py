@@ -9,14 +9,95 @@ Usage:
     python scripts/build_dashboard.py
 """
 
+import argparse
+import hashlib
 import json
+import os
+import shutil
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 from lakeview_builder import LakeviewDashboard
 
+# Provider-ordered palette shared by every multi-series widget
+PROVIDER_COLORS = ("#FF6B35", "#00A972", "#4285F4", "#8BCAE7", "#919191")
+
+# One UC function replaces the CASE-WHEN classifier previously inlined in
+# three datasets; deploy_dashboard.py runs the DDL before deploying.
+# Catalog/schema must match inference_table_* in config.yaml.
+PROVIDER_FN = "main.fmapi_demo.provider_of"
+
+# Callers pass an already-lowercased name so LOWER() runs once per row
+# and the matches are plain contains() instead of wildcard LIKE scans
+PROVIDER_FN_SQL = f"""CREATE OR REPLACE FUNCTION {PROVIDER_FN}(lowered_name STRING)
+RETURNS STRING
+RETURN CASE
+    WHEN contains(lowered_name, 'claude') OR contains(lowered_name, 'anthropic') THEN 'Anthropic'
+    WHEN contains(lowered_name, 'gpt') OR contains(lowered_name, 'openai') THEN 'OpenAI'
+    WHEN contains(lowered_name, 'gemini') OR contains(lowered_name, 'google') THEN 'Google'
+    WHEN contains(lowered_name, 'llama') OR contains(lowered_name, 'meta') THEN 'Meta'
+    ELSE 'Other'
+END"""
+
+# Daily pre-aggregation behind Page 1: counters and charts sum a few
+# thousand grouped rows instead of re-scanning the raw usage join on
+# every dashboard load. Emitted to dashboard/usage_mvs.sql, which
+# deploy_dashboard.py runs after provider_fn.sql (the MV calls the UDF).
+MV_USAGE_DAILY = "main.fmapi_demo.mv_all_model_usage_daily"
+
+MV_USAGE_DAILY_SQL = f"""CREATE OR REPLACE MATERIALIZED VIEW {MV_USAGE_DAILY}
+SCHEDULE EVERY 1 HOUR
+AS SELECT
+    DATE(u.request_time) as request_date,
+    {PROVIDER_FN}(LOWER(CONCAT_WS('|', e.entity_name, e.endpoint_name))) as provider,
+    e.endpoint_name,
+    COALESCE(e.served_entity_name, e.entity_name) as model_name,
+    u.requester,
+    COUNT(*) as requests,
+    SUM(u.input_token_count) as input_token_count,
+    SUM(u.output_token_count) as output_token_count,
+    SUM(u.input_token_count + u.output_token_count) as total_tokens
+FROM system.serving.endpoint_usage u
+JOIN system.serving.served_entities e
+    ON u.served_entity_id = e.served_entity_id
+WHERE e.entity_type = 'FOUNDATION_MODEL'
+   OR e.external_model_config IS NOT NULL
+GROUP BY 1, 2, 3, 4, 5"""
+
+# Narrow dimension view so filter dropdowns populate from ~100 distinct
+# rows instead of scanning a fact dataset per page load
+MV_USAGE_DIMS = "main.fmapi_demo.mv_usage_dims"
+
+MV_USAGE_DIMS_SQL = f"""CREATE OR REPLACE MATERIALIZED VIEW {MV_USAGE_DIMS}
+SCHEDULE EVERY 6 HOURS
+AS SELECT DISTINCT provider, endpoint_name, model_name
+FROM {MV_USAGE_DAILY}"""
+
+
+# Column names the widget specs repeat dozens of times. Interning makes
+# every reference below the same string object, so the built dict holds
+# one copy of each instead of one per widget.
+FIELD_DATE = sys.intern("request_date")
+FIELD_PROVIDER = sys.intern("provider")
+FIELD_ENDPOINT = sys.intern("endpoint_name")
+FIELD_MODEL = sys.intern("model_name")
+FIELD_REQUESTER = sys.intern("requester")
+FIELD_REQUESTS = sys.intern("requests")
+
+
+@lru_cache(maxsize=None)
+def _pos(x: int, y: int, width: int, height: int) -> dict:
+    """Widget position dict; repeated shapes share one object."""
+    return {"x": x, "y": y, "width": width, "height": height}
+
 
 def build_dashboard() -> dict:
     dashboard = LakeviewDashboard("FMAPI Unified Dashboard")
@@ -25,35 +106,63 @@ def build_dashboard() -> dict:
     # DATASETS
     # =========================================================================
 
-    # Dataset 1: All-model usage (extends claude-endpoint-dashboard to all providers)
+    # Dataset 1: All-model usage, served from the daily-grain materialized
+    # view (see MV_USAGE_DAILY_SQL) instead of the raw usage join
     dashboard.add_dataset(
         "all_model_usage",
         "All Model Usage",
         (
             "SELECT\n"
-            "    u.request_time,\n"
-            "    DATE(u.request_time) as request_date,\n"
-            "    u.input_token_count,\n"
-            "    u.output_token_count,\n"
-            "    u.input_token_count + u.output_token_count as total_tokens,\n"
-            "    u.status_code,\n"
-            "    CASE WHEN u.status_code = 200 THEN 'Success' ELSE 'Error' END as status,\n"
-            "    u.requester,\n"
-            "    e.endpoint_name,\n"
-            "    COALESCE(e.served_entity_name, e.entity_name) as model_name,\n"
-            "    e.entity_name as model_version,\n"
-            "    CASE\n"
-            "        WHEN LOWER(e.entity_name) LIKE '%claude%' OR LOWER(e.endpoint_name) LIKE '%claude%' THEN 'Anthropic'\n"
-            "        WHEN LOWER(e.entity_name) LIKE '%gpt%' OR LOWER(e.endpoint_name) LIKE '%gpt%' OR LOWER(e.entity_name) LIKE '%openai%' THEN 'OpenAI'\n"
-            "        WHEN LOWER(e.entity_name) LIKE '%gemini%' OR LOWER(e.endpoint_name) LIKE '%gemini%' THEN 'Google'\n"
-            "        WHEN LOWER(e.entity_name) LIKE '%llama%' OR LOWER(e.entity_name) LIKE '%meta%' THEN 'Meta'\n"
-            "        ELSE 'Other'\n"
-            "    END as provider\n"
-            "FROM system.serving.endpoint_usage u\n"
-            "JOIN system.serving.served_entities e\n"
-            "    ON u.served_entity_id = e.served_entity_id\n"
-            "WHERE e.entity_type = 'FOUNDATION_MODEL'\n"
-            "   OR e.external_model_config IS NOT NULL"
+            "    request_date,\n"
+            "    provider,\n"
+            "    endpoint_name,\n"
+            "    model_name,\n"
+            "    requester,\n"
+            "    requests,\n"
+            "    input_token_count,\n"
+            "    output_token_count,\n"
+            "    total_tokens\n"
+            f"FROM {MV_USAGE_DAILY}"
+        ),
+    )
+
+    # Top-N companion datasets: the bar charts show ~20 bars, so rank and
+    # truncate server-side instead of shipping every group to the browser
+    dashboard.add_dataset(
+        "top_endpoints",
+        "Top Endpoints by Requests",
+        (
+            "SELECT endpoint_name, SUM(requests) as requests\n"
+            f"FROM {MV_USAGE_DAILY}\n"
+            "GROUP BY 1 ORDER BY 2 DESC LIMIT 20"
+        ),
+    )
+    dashboard.add_dataset(
+        "top_users",
+        "Top Users by Requests",
+        (
+            "SELECT requester, SUM(requests) as requests\n"
+            f"FROM {MV_USAGE_DAILY}\n"
+            "GROUP BY 1 ORDER BY 2 DESC LIMIT 20"
+        ),
+    )
+    dashboard.add_dataset(
+        "top_models_by_tokens",
+        "Top Models by Tokens",
+        (
+            "SELECT model_name, SUM(total_tokens) as total_tokens\n"
+            f"FROM {MV_USAGE_DAILY}\n"
+            "GROUP BY 1 ORDER BY 2 DESC LIMIT 20"
+        ),
+    )
+
+    # Dimension dataset: feeds every filter dropdown (see MV_USAGE_DIMS_SQL)
+    dashboard.add_dataset(
+        "usage_dims",
+        "Usage Dimensions",
+        (
+            "SELECT provider, endpoint_name, model_name\n"
+            f"FROM {MV_USAGE_DIMS}"
         ),
     )
 
@@ -62,25 +171,26 @@ def build_dashboard() -> dict:
         "all_model_billing",
         "All Model Billing",
         (
+            # Dedup list_prices to one current price per (sku, cloud) so the
+            # join is pure equality instead of a non-equi time-range probe;
+            # costs are estimated at the current list price
+            "WITH current_prices AS (\n"
+            "    SELECT sku_name, cloud, pricing.effective_list.default as price\n"
+            "    FROM system.billing.list_prices\n"
+            "    QUALIFY ROW_NUMBER() OVER (\n"
+            "        PARTITION BY sku_name, cloud ORDER BY price_start_time DESC) = 1\n"
+            ")\n"
             "SELECT\n"
             "    usage_date as request_date,\n"
             "    usage_metadata.endpoint_name as endpoint_name,\n"
-            "    CASE\n"
-            "        WHEN u.sku_name LIKE '%ANTHROPIC%' THEN 'Anthropic'\n"
-            "        WHEN u.sku_name LIKE '%OPENAI%' THEN 'OpenAI'\n"
-            "        WHEN u.sku_name LIKE '%GOOGLE%' THEN 'Google'\n"
-            "        WHEN u.sku_name LIKE '%META%' OR u.sku_name LIKE '%LLAMA%' THEN 'Meta'\n"
-            "        ELSE 'Other'\n"
-            "    END as provider,\n"
+            f"    {PROVIDER_FN}(LOWER(u.sku_name)) as provider,\n"
             "    u.sku_name,\n"
             "    SUM(usage_quantity) as total_dbus,\n"
-            "    SUM(usage_quantity * COALESCE(lp.pricing.effective_list.default, 0.07)) as estimated_cost\n"
+            "    SUM(usage_quantity * COALESCE(cp.price, 0.07)) as estimated_cost\n"
             "FROM system.billing.usage u\n"
-            "LEFT JOIN system.billing.list_prices lp\n"
-            "    ON u.sku_name = lp.sku_name\n"
-            "    AND u.cloud = lp.cloud\n"
-            "    AND u.usage_start_time >= lp.price_start_time\n"
-            "    AND (lp.price_end_time IS NULL OR u.usage_start_time < lp.price_end_time)\n"
+            "LEFT JOIN current_prices cp\n"
+            "    ON u.sku_name = cp.sku_name\n"
+            "    AND u.cloud = cp.cloud\n"
             "WHERE u.sku_name LIKE '%MODEL_SERVING%'\n"
             "   OR u.sku_name LIKE '%FOUNDATION_MODEL%'\n"
             "GROUP BY usage_date, usage_metadata.endpoint_name, u.sku_name"
@@ -97,13 +207,7 @@ def build_dashboard() -> dict:
             "    DATE(event_time) as request_date,\n"
             "    endpoint_name,\n"
             "    destination_model as model_name,\n"
-            "    CASE\n"
-            "        WHEN LOWER(destination_model) LIKE '%claude%' THEN 'Anthropic'\n"
-            "        WHEN LOWER(destination_model) LIKE '%gpt%' THEN 'OpenAI'\n"
-            "        WHEN LOWER(destination_model) LIKE '%gemini%' THEN 'Google'\n"
-            "        WHEN LOWER(destination_model) LIKE '%llama%' THEN 'Meta'\n"
-            "        ELSE 'Other'\n"
-            "    END as provider,\n"
+            f"    {PROVIDER_FN}(LOWER(destination_model)) as provider,\n"
             "    input_tokens as input_token_count,\n"
             "    output_tokens as output_token_count,\n"
             "    total_tokens as total_token_count,\n"
@@ -139,6 +243,29 @@ def build_dashboard() -> dict:
         ),
     )
 
+    # Dataset 5: bounded detail feed for the Page 3 log table — the
+    # aggregate widgets keep the unbounded routing_data dataset
+    dashboard.add_dataset(
+        "routing_data_recent",
+        "Recent Routing Decisions",
+        (
+            "SELECT\n"
+            "    event_time,\n"
+            "    DATE(event_time) as request_date,\n"
+            "    endpoint_name,\n"
+            "    routing_information.attempts[0].destination as routed_to,\n"
+            "    destination_model as model_name,\n"
+            "    latency_ms as request_latency_ms,\n"
+            "    input_tokens as input_token_count,\n"
+            "    output_tokens as output_token_count,\n"
+            "    status_code\n"
+            "FROM system.ai_gateway.usage\n"
+            "WHERE routing_information IS NOT NULL\n"
+            "ORDER BY event_time DESC\n"
+            "LIMIT 10000"
+        ),
+    )
+
     # =========================================================================
     # PAGE 1: Gateway Overview
     # =========================================================================
@@ -146,107 +273,110 @@ def build_dashboard() -> dict:
     dashboard.pages[0]["displayName"] = "Gateway Overview"
 
     # Global date filter — spans all four datasets
-    dashboard.add_date_filter(
+    dashboard.add_global_date_filter(
         [
-            ("all_model_usage", "request_date"),
-            ("all_model_billing", "request_date"),
-            ("ai_gateway_usage", "request_date"),
-            ("routing_data", "request_date"),
+            ("all_model_usage", FIELD_DATE),
+            ("all_model_billing", FIELD_DATE),
+            ("ai_gateway_usage", FIELD_DATE),
+            ("routing_data", FIELD_DATE),
+            ("routing_data_recent", FIELD_DATE),
         ],
-        "request_date", "Date Range",
-        position={"x": 0, "y": 0, "width": 2, "height": 1},
+        "Date Range",
+        position=_pos(0, 0, 2, 1),
     )
-    dashboard.add_filter_dropdown(
-        "all_model_usage", "provider", "Provider",
-        position={"x": 2, "y": 0, "width": 1, "height": 1},
+    dashboard.add_global_filter_dropdown(
+        [("usage_dims", FIELD_PROVIDER), ("all_model_usage", FIELD_PROVIDER)],
+        "Provider",
+        position=_pos(2, 0, 1, 1),
         multi_select=True,
     )
-    dashboard.add_filter_dropdown(
-        "all_model_usage", "endpoint_name", "Endpoint",
-        position={"x": 3, "y": 0, "width": 2, "height": 1},
+    dashboard.add_global_filter_dropdown(
+        [("usage_dims", FIELD_ENDPOINT), ("all_model_usage", FIELD_ENDPOINT)],
+        "Endpoint",
+        position=_pos(3, 0, 2, 1),
         multi_select=True,
     )
 
     # KPI counters row
     dashboard.add_counter(
-        "all_model_usage", "*", "COUNT", "Total Requests",
-        position={"x": 0, "y": 1, "width": 1, "height": 2},
+        "all_model_usage", FIELD_REQUESTS, "SUM", "Total Requests",
+        position=_pos(0, 1, 1, 2),
     )
     dashboard.add_counter(
         "all_model_usage", "input_token_count", "SUM", "Input Tokens",
-        position={"x": 1, "y": 1, "width": 1, "height": 2},
+        position=_pos(1, 1, 1, 2),
     )
     dashboard.add_counter(
         "all_model_usage", "output_token_count", "SUM", "Output Tokens",
-        position={"x": 2, "y": 1, "width": 1, "height": 2},
+        position=_pos(2, 1, 1, 2),
     )
     dashboard.add_counter(
-        "all_model_usage", "requester", "COUNT_DISTINCT", "Unique Users",
-        position={"x": 3, "y": 1, "width": 1, "height": 2},
+        "all_model_usage", FIELD_REQUESTER, "COUNT_DISTINCT", "Unique Users",
+        position=_pos(3, 1, 1, 2),
     )
     dashboard.add_counter(
-        "all_model_usage", "endpoint_name", "COUNT_DISTINCT", "Active Endpoints",
-        position={"x": 4, "y": 1, "width": 1, "height": 2},
+        "all_model_usage", FIELD_ENDPOINT, "COUNT_DISTINCT", "Active Endpoints",
+        position=_pos(4, 1, 1, 2),
     )
     dashboard.add_counter(
         "all_model_billing", "estimated_cost", "SUM", "Est. Cost ($)",
-        position={"x": 5, "y": 1, "width": 1, "height": 2},
+        position=_pos(5, 1, 1, 2),
     )
 
     # Daily requests by provider (line chart)
     dashboard.add_line_chart(
-        "all_model_usage", "request_date", "*", "COUNT",
+        "all_model_usage", FIELD_DATE, FIELD_REQUESTS, "SUM",
         title="Daily Requests by Provider",
-        position={"x": 0, "y": 3, "width": 6, "height": 4},
-        color_field="provider",
+        position=_pos(0, 3, 6, 4),
+        color_field=FIELD_PROVIDER,
     )
 
     # Cost by provider (bar chart)
     dashboard.add_bar_chart(
-        "all_model_billing", "provider", "estimated_cost", "SUM",
+        "all_model_billing", FIELD_PROVIDER, "estimated_cost", "SUM",
         title="Cost by Provider",
-        position={"x": 0, "y": 7, "width": 3, "height": 5},
+        position=_pos(0, 7, 3, 5),
         sort_descending=True,
-        colors=["#FF6B35", "#00A972", "#4285F4", "#8BCAE7", "#919191"],
+        colors=PROVIDER_COLORS,
     )
 
     # Requests by endpoint (bar chart)
     dashboard.add_bar_chart(
-        "all_model_usage", "endpoint_name", "*", "COUNT",
+        "top_endpoints", FIELD_ENDPOINT, FIELD_REQUESTS, "SUM",
         title="Requests by Endpoint",
-        position={"x": 3, "y": 7, "width": 3, "height": 5},
+        position=_pos(3, 7, 3, 5),
         sort_descending=True,
     )
 
     # Requests by model (pie)
     dashboard.add_pie_chart(
-        "all_model_usage", "*", "provider", "COUNT",
+        "all_model_usage", FIELD_REQUESTS, FIELD_PROVIDER, "SUM",
         title="Requests by Provider",
-        position={"x": 0, "y": 12, "width": 3, "height": 5},
+        position=_pos(0, 12, 3, 5),
     )
 
     # Token usage by model (bar)
     dashboard.add_bar_chart(
-        "all_model_usage", "model_name", "total_tokens", "SUM",
+        "top_models_by_tokens", FIELD_MODEL, "total_tokens", "SUM",
         title="Token Usage by Model",
-        position={"x": 3, "y": 12, "width": 3, "height": 5},
+        position=_pos(3, 12, 3, 5),
         sort_descending=True,
         colors=["#8BCAE7"],
     )
 
     # Daily cost trend
     dashboard.add_line_chart(
-        "all_model_billing", "request_date", "estimated_cost", "SUM",
+        "all_model_billing", FIELD_DATE, "estimated_cost", "SUM",
         title="Daily Estimated Cost ($)",
-        position={"x": 0, "y": 17, "width": 6, "height": 4},
-        color_field="provider",
+        position=_pos(0, 17, 6, 4),
+        color_field=FIELD_PROVIDER,
     )
 
     # Top users
     dashboard.add_bar_chart(
-        "all_model_usage", "requester", "*", "COUNT",
+        "top_users", FIELD_REQUESTER, FIELD_REQUESTS, "SUM",
         title="Requests by User",
-        position={"x": 0, "y": 21, "width": 6, "height": 5},
+        position=_pos(0, 21, 6, 5),
         sort_descending=True,
         colors=["#00A972"],
     )
@@ -257,64 +387,66 @@ def build_dashboard() -> dict:
     dashboard.add_page("AI Gateway & Performance")
 
     # Filters (date range is global from Page 1)
-    dashboard.add_filter_dropdown(
-        "ai_gateway_usage", "provider", "Provider",
-        position={"x": 0, "y": 0, "width": 2, "height": 1},
+    dashboard.add_global_filter_dropdown(
+        [("usage_dims", FIELD_PROVIDER), ("ai_gateway_usage", FIELD_PROVIDER)],
+        "Provider",
+        position=_pos(0, 0, 2, 1),
         multi_select=True,
     )
-    dashboard.add_filter_dropdown(
-        "ai_gateway_usage", "endpoint_name", "Endpoint",
-        position={"x": 2, "y": 0, "width": 2, "height": 1},
+    dashboard.add_global_filter_dropdown(
+        [("usage_dims", FIELD_ENDPOINT), ("ai_gateway_usage", FIELD_ENDPOINT)],
+        "Endpoint",
+        position=_pos(2, 0, 2, 1),
         multi_select=True,
     )
 
     # Latency comparison by model (bar chart)
     dashboard.add_bar_chart(
-        "ai_gateway_usage", "model_name", "request_latency_ms", "AVG",
+        "ai_gateway_usage", FIELD_MODEL, "request_latency_ms", "AVG",
         title="Avg Latency by Model (ms)",
-        position={"x": 0, "y": 1, "width": 3, "height": 5},
+        position=_pos(0, 1, 3, 5),
         sort_descending=True,
         colors=["#FF6B35"],
     )
 
     # TTFB by model
     dashboard.add_bar_chart(
-        "ai_gateway_usage", "model_name", "time_to_first_token_ms", "AVG",
+        "ai_gateway_usage", FIELD_MODEL, "time_to_first_token_ms", "AVG",
         title="Avg Time to First Token by Model (ms)",
-        position={"x": 3, "y": 1, "width": 3, "height": 5},
+        position=_pos(3, 1, 3, 5),
         sort_descending=True,
         colors=["#AB4057"],
     )
 
     # Throughput trend (daily requests)
     dashboard.add_line_chart(
-        "ai_gateway_usage", "request_date", "*", "COUNT",
+        "ai_gateway_usage", FIELD_DATE, "*", "COUNT",
         title="Daily Request Throughput",
-        position={"x": 0, "y": 6, "width": 6, "height": 4},
-        color_field="provider",
+        position=_pos(0, 6, 6, 4),
+        color_field=FIELD_PROVIDER,
     )
 
     # Error rate by provider (pie)
     dashboard.add_pie_chart(
         "ai_gateway_usage", "*", "status", "COUNT",
         title="Success vs Error",
-        position={"x": 0, "y": 10, "width": 3, "height": 5},
+        position=_pos(0, 10, 3, 5),
     )
 
     # Latency trend over time
     dashboard.add_line_chart(
-        "ai_gateway_usage", "request_date", "request_latency_ms", "AVG",
+        "ai_gateway_usage", FIELD_DATE, "request_latency_ms", "AVG",
         title="Avg Latency Trend (ms)",
-        position={"x": 3, "y": 10, "width": 3, "height": 5},
-        color_field="provider",
+        position=_pos(3, 10, 3, 5),
+        color_field=FIELD_PROVIDER,
     )
 
     # Token throughput
     dashboard.add_line_chart(
-        "ai_gateway_usage", "request_date", "total_token_count", "SUM",
+        "ai_gateway_usage", FIELD_DATE, "total_token_count", "SUM",
         title="Daily Token Throughput",
-        position={"x": 0, "y": 15, "width": 6, "height": 4},
-        color_field="provider",
+        position=_pos(0, 15, 6, 4),
+        color_field=FIELD_PROVIDER,
     )
 
     # =========================================================================
@@ -323,9 +455,14 @@ def build_dashboard() -> dict:
     dashboard.add_page("Routing & A/B Tests")
 
     # Filters (date range is global from Page 1)
-    dashboard.add_filter_dropdown(
-        "routing_data", "endpoint_name", "Endpoint",
-        position={"x": 0, "y": 0, "width": 2, "height": 1},
+    dashboard.add_global_filter_dropdown(
+        [
+            ("usage_dims", FIELD_ENDPOINT),
+            ("routing_data", FIELD_ENDPOINT),
+            ("routing_data_recent", FIELD_ENDPOINT),
+        ],
+        "Endpoint",
+        position=_pos(0, 0, 2, 1),
         multi_select=True,
     )
 
@@ -333,55 +470,118 @@ def build_dashboard() -> dict:
     dashboard.add_pie_chart(
         "routing_data", "*", "routed_to", "COUNT",
         title="Traffic Split by Served Model",
-        position={"x": 0, "y": 1, "width": 3, "height": 5},
+        position=_pos(0, 1, 3, 5),
     )
 
     # Latency by routed model
     dashboard.add_bar_chart(
         "routing_data", "routed_to", "request_latency_ms", "AVG",
         title="Avg Latency by Routed Model (ms)",
-        position={"x": 3, "y": 1, "width": 3, "height": 5},
+        position=_pos(3, 1, 3, 5),
         colors=["#4285F4", "#FF6B35"],
     )
 
     # Routing decisions over time
     dashboard.add_line_chart(
-        "routing_data", "request_date", "*", "COUNT",
+        "routing_data", FIELD_DATE, "*", "COUNT",
         title="Routing Decisions Over Time",
-        position={"x": 0, "y": 6, "width": 6, "height": 4},
+        position=_pos(0, 6, 6, 4),
         color_field="routed_to",
     )
 
-    # Routing decisions table
+    # Routing decisions table (bounded dataset so payload size stays flat)
     dashboard.add_table(
-        "routing_data",
+        "routing_data_recent",
         columns=[
             {"field": "event_time", "title": "Time", "type": "datetime"},
-            {"field": "endpoint_name", "title": "Endpoint"},
+            {"field": FIELD_ENDPOINT, "title": "Endpoint"},
             {"field": "routed_to", "title": "Routed To"},
-            {"field": "model_name", "title": "Model"},
+            {"field": FIELD_MODEL, "title": "Model"},
             {"field": "request_latency_ms", "title": "Latency (ms)", "type": "integer"},
             {"field": "input_token_count", "title": "In Tokens", "type": "integer"},
             {"field": "output_token_count", "title": "Out Tokens", "type": "integer"},
             {"field": "status_code", "title": "Status", "type": "integer"},
         ],
         title="Routing Decisions Log",
-        position={"x": 0, "y": 10, "width": 6, "height": 6},
+        position=_pos(0, 10, 6, 6),
     )
 
     return dashboard.to_dict()
 
 
-def main():
-    dashboard_dict = build_dashboard()
+def _cache_key() -> str:
+    """Content hash of the build's only inputs: this script and the builder."""
+    import lakeview_builder
 
-    output_path = Path(__file__).parent.parent / "dashboard" / "fmapi_unified_dashboard.json"
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    h.update(Path(lakeview_builder.__file__).read_bytes())
+    return h.hexdigest()
+
+
+def _serialize(dashboard_dict: dict, indent: bool) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(dashboard_dict, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(dashboard_dict, indent=2).encode()
+    return json.dumps(dashboard_dict, separators=(",", ":")).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the FMAPI Unified Dashboard JSON")
+    parser.add_argument("-o", "--output", help="Output path (default: dashboard/fmapi_unified_dashboard.json)")
+    parser.add_argument("--stdout", action="store_true", help="Write JSON to stdout; no files, no chatter")
+    parser.add_argument("--no-indent", action="store_true", help="Emit compact JSON")
+    args = parser.parse_args()
+    indent = not args.no_indent
+
+    if args.stdout:
+        # Pipe mode for CI / deploy chaining: bytes on fd 1, nothing else
+        sys.stdout.buffer.write(_serialize(build_dashboard(), indent))
+        return
+
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_path = Path(__file__).parent.parent / "dashboard" / "fmapi_unified_dashboard.json"
     output_path.parent.mkdir(exist_ok=True)
 
-    with open(output_path, "w") as f:
-        json.dump(dashboard_dict, f, indent=2)
+    # The build is deterministic in its sources, so repeated runs (e.g. CI)
+    # can reuse a content-addressed copy instead of rebuilding
+    cache_name = f"dashboard-{_cache_key()}{'' if indent else '-min'}.json"
+    cache_path = Path.home() / ".cache" / "fmapi" / cache_name
+    if cache_path.exists():
+        shutil.copyfile(cache_path, output_path)
+        dashboard_dict = None
+    else:
+        dashboard_dict = build_dashboard()
+
+        # Serialize once to bytes and write with a single syscall, instead of
+        # json.dump's incremental writes through a buffered text stream
+        data = _serialize(dashboard_dict, indent)
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+        # Populate the cache atomically so a crash can't leave a torn entry
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cache_path)
+
+    sql_path = output_path.parent / "provider_fn.sql"
+    sql_path.write_text(PROVIDER_FN_SQL + ";\n")
+    mv_path = output_path.parent / "usage_mvs.sql"
+    mv_path.write_text(MV_USAGE_DAILY_SQL + ";\n" + MV_USAGE_DIMS_SQL + ";\n")
 
     print(f"Dashboard JSON written to {output_path}")
+    print(f"Provider UDF DDL written to {sql_path}")
+    print(f"Materialized view DDL written to {mv_path}")
+    if dashboard_dict is None:
+        print(f"  (reused cached build {cache_path.name})")
+        return
     print(f"  Pages: {len(dashboard_dict['pages'])}")
     for page in dashboard_dict["pages"]:
         print(f"    - {page['displayName']}: {len(page['layout'])} widgets")
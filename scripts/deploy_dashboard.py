@@ -7,100 +7,212 @@ Usage:
     python scripts/deploy_dashboard.py --profile fevm-demo-classic --warehouse-id abc123 --parent-path /Users/user@company.com
 """
 
+from __future__ import annotations
+
 import argparse
+import configparser
+import gzip
 import json
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _load_profile(profile: str) -> tuple[str, str]:
+    """Resolve (host, token) for a CLI profile without shelling out.
+
+    Reads ~/.databrickscfg directly; profiles that authenticate via OAuth
+    (no token line in the file) fall back to `databricks auth token`.
+    """
+    cfg = configparser.ConfigParser()
+    cfg.read(os.path.expanduser("~/.databrickscfg"))
+    host = token = ""
+    if cfg.has_section(profile):
+        host = cfg[profile].get("host", "").rstrip("/")
+        token = cfg[profile].get("token", "")
+    if not token:
+        result = subprocess.run(
+            ["databricks", "auth", "token", "--profile", profile],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            print(f"Error getting token for profile '{profile}': {result.stderr}")
+            sys.exit(1)
+        token = json.loads(result.stdout)["access_token"]
+    if not host:
+        host = os.environ.get("DATABRICKS_HOST", "").rstrip("/")
+    if not host:
+        print(
+            f"Error: no host for profile '{profile}' in ~/.databrickscfg "
+            "and DATABRICKS_HOST is unset"
+        )
+        sys.exit(1)
+    return host, token
+
+
+def _session(token: str) -> "requests.Session":
+    """One keep-alive session for every REST call in the deploy."""
+    import requests
+
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    session.headers["Content-Type"] = "application/json"
+    return session
+
+
+def run_setup_sql(session: requests.Session, host: str, warehouse_id: str):
+    """Run the dashboard's supporting DDL (the provider_of UDF and MVs).
+
+    Raises RuntimeError when a statement fails — every Page 1 dataset
+    references these objects, so deploying past a failed DDL would ship
+    a dashboard whose widgets all error.
+    """
+    sql_dir = Path(__file__).parent.parent / "dashboard"
+    failed = []
+    for sql_file in sorted(sql_dir.glob("*.sql")):
+        ok = True
+        for statement in filter(None, (s.strip() for s in sql_file.read_text().split(";"))):
+            resp = session.post(
+                f"{host}/api/2.0/sql/statements",
+                data=_dumps({
+                    "warehouse_id": warehouse_id,
+                    "statement": statement,
+                    "wait_timeout": "50s",
+                }),
+            )
+            if resp.status_code != 200:
+                print(f"  Error: setup SQL in {sql_file.name} failed: {resp.text.strip()}")
+                ok = False
+                continue
+            # Statement errors come back as HTTP 200 with status.state FAILED
+            status = resp.json().get("status") or {}
+            if status.get("state") == "FAILED":
+                message = (status.get("error") or {}).get("message", "unknown error")
+                print(f"  Error: setup SQL in {sql_file.name} failed: {message}")
+                ok = False
+        if ok:
+            print(f"  Ran setup SQL: {sql_file.name}")
+        else:
+            failed.append(sql_file.name)
+    if failed:
+        raise RuntimeError(f"dashboard setup SQL did not apply: {', '.join(failed)}")
+
+
+def deploy_dashboard(
+    profile: str,
+    warehouse_id: str,
+    parent_path: str,
+    dashboard_name: str,
+    dashboard_dict: dict | None = None,
+):
+    """Deploy the dashboard via Databricks API.
+
+    Pass ``dashboard_dict`` to deploy an in-memory spec directly (see
+    build_and_deploy.py); otherwise the committed JSON file is loaded.
+    """
+    if dashboard_dict is not None:
+        dashboard = dashboard_dict
+    else:
+        dashboard_file = Path(__file__).parent.parent / "dashboard" / "fmapi_unified_dashboard.json"
 
-def deploy_dashboard(profile: str, warehouse_id: str, parent_path: str, dashboard_name: str):
-    """Deploy the dashboard JSON via Databricks API."""
+        if not dashboard_file.exists():
+            print(f"Error: Dashboard file not found: {dashboard_file}")
+            sys.exit(1)
 
-    dashboard_file = Path(__file__).parent.parent / "dashboard" / "fmapi_unified_dashboard.json"
+        with open(dashboard_file) as f:
+            dashboard = json.load(f)
 
-    if not dashboard_file.exists():
-        print(f"Error: Dashboard file not found: {dashboard_file}")
-        sys.exit(1)
+    host, token = _load_profile(profile)
+    session = _session(token)
 
-    with open(dashboard_file) as f:
-        dashboard = json.load(f)
+    # The setup DDL (UDF + MVs) and the dashboard create call are
+    # independent until the dashboard first runs a query, so overlap them:
+    # the DDL runs on a worker thread while the main thread deploys.
+    print("Running dashboard setup SQL...")
+    executor = ThreadPoolExecutor(max_workers=1)
+    setup_future = executor.submit(run_setup_sql, session, host, warehouse_id)
 
-    payload = {
+    # The spec is mostly repetitive SQL text, so gzip shrinks the upload
+    # several-fold; Databricks accepts Content-Encoding: gzip request bodies
+    payload = gzip.compress(_dumps({
         "display_name": dashboard_name,
         "warehouse_id": warehouse_id,
         "parent_path": parent_path,
-        "serialized_dashboard": json.dumps(dashboard),
-    }
-
-    payload_file = "/tmp/fmapi_dashboard_payload.json"
-    with open(payload_file, "w") as f:
-        json.dump(payload, f)
+        "serialized_dashboard": _dumps(dashboard).decode(),
+    }), compresslevel=3)
+    gzip_headers = {"Content-Encoding": "gzip"}
 
     # Create dashboard
-    cmd = f"databricks api post /api/2.0/lakeview/dashboards --profile={profile} --json @{payload_file}"
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    resp = session.post(
+        f"{host}/api/2.0/lakeview/dashboards", data=payload, headers=gzip_headers
+    )
 
-    if result.returncode != 0:
-        if "already exists" in result.stderr:
+    if resp.status_code != 200:
+        if "already exists" in resp.text:
             # Find existing dashboard via workspace get-status (avoids paginated list API)
             print("Dashboard already exists — finding and updating...")
             dashboard_ws_path = f"{parent_path}/{dashboard_name}.lvdash.json"
-            status_cmd = f'databricks workspace get-status "{dashboard_ws_path}" --profile={profile} -o json'
-            status_result = subprocess.run(status_cmd, shell=True, capture_output=True, text=True)
-            if status_result.returncode != 0:
-                print(f"Error finding existing dashboard: {status_result.stderr}")
+            status_resp = session.get(
+                f"{host}/api/2.0/workspace/get-status",
+                params={"path": dashboard_ws_path},
+            )
+            if status_resp.status_code != 200:
+                print(f"Error finding existing dashboard: {status_resp.text}")
                 sys.exit(1)
-            status_stdout = status_result.stdout
-            json_start = status_stdout.find("{")
-            if json_start > 0:
-                status_stdout = status_stdout[json_start:]
-            existing_id = json.loads(status_stdout).get("resource_id")
+            existing_id = status_resp.json().get("resource_id")
             if not existing_id:
                 print("Error: Could not find existing dashboard resource_id")
                 sys.exit(1)
 
             print(f"  Found existing dashboard: {existing_id}")
-            update_cmd = f"databricks api patch /api/2.0/lakeview/dashboards/{existing_id} --profile={profile} --json @{payload_file}"
-            result = subprocess.run(update_cmd, shell=True, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"Error updating dashboard: {result.stderr}")
+            resp = session.patch(
+                f"{host}/api/2.0/lakeview/dashboards/{existing_id}",
+                data=payload,
+                headers=gzip_headers,
+            )
+            if resp.status_code != 200:
+                print(f"Error updating dashboard: {resp.text}")
                 sys.exit(1)
         else:
-            print(f"Error creating dashboard: {result.stderr}")
+            print(f"Error creating dashboard: {resp.text}")
             sys.exit(1)
 
-    # Parse response (strip any ANSI warnings before JSON)
-    stdout = result.stdout
-    json_start = stdout.find("{")
-    if json_start > 0:
-        stdout = stdout[json_start:]
+    # Join the setup DDL before publishing — the published dashboard can
+    # query the UDF/MVs immediately
+    try:
+        setup_future.result()
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    executor.shutdown()
 
-    response = json.loads(stdout)
+    response = resp.json()
     dashboard_id = response.get("dashboard_id")
 
     if not dashboard_id:
         print(f"Unexpected response: {response}")
         sys.exit(1)
 
-    # Get workspace URL
-    host = ""
-    profile_cmd = f"databricks auth env --profile={profile}"
-    profile_result = subprocess.run(profile_cmd, shell=True, capture_output=True, text=True)
-    for line in profile_result.stdout.split("\n"):
-        if "DATABRICKS_HOST" in line and "=" in line:
-            # Format is: export DATABRICKS_HOST=https://...  or DATABRICKS_HOST="https://..."
-            host = line.split("=", 1)[1].strip().strip('"').strip("'")
-            break
-
     print(f"Dashboard created!")
     print(f"  ID: {dashboard_id}")
-    if host:
-        print(f"  URL: {host}/dashboardsv3/{dashboard_id}")
+    print(f"  URL: {host}/dashboardsv3/{dashboard_id}")
 
     # Publish
-    publish_cmd = f"databricks api post /api/2.0/lakeview/dashboards/{dashboard_id}/published --profile={profile} --json '{{}}'"
-    subprocess.run(publish_cmd, shell=True, capture_output=True)
+    session.post(f"{host}/api/2.0/lakeview/dashboards/{dashboard_id}/published", data=b"{}")
     print("  Published!")
 
     return dashboard_id